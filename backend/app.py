@@ -1,93 +1,202 @@
 import os
+import json
 import datetime
-from flask import Flask, jsonify, request
+import click
+from flask import Blueprint, Flask, current_app, jsonify, request
 from flask_cors import CORS
-from flask_migrate import Migrate
-from flask_jwt_extended import JWTManager
-from model import db, User, Notice, WorkerInfo, Issue, Doctor, StudentMedical
-from sqlalchemy import func
+from flask_jwt_extended import JWTManager, create_access_token, verify_jwt_in_request
+from model import db, User, WorkerInfo, Issue, IssueVote, Doctor, StudentMedical
+from model import IssueDailyStat, ReporterStat, NoticeMonthlyStat
+import rollups
+import db_config
+import identity
+from passwords import hasher
+from cache import response_cache
+from triage import triage_service, DEFAULT_RESULT
+from duplicates import duplicate_index
+from assignment import assignment_bp, auto_assign, CATEGORIES
+from metrics import metrics_bp, request_metrics
+from compression import compressor
+from classifier import LocalClassifier
+from sqlalchemy import func, inspect, text, event
 from auth import auth_bp
-from issues import issues_bp
+from issues import issues_bp, role_required
 from notice import notices_bp
 from dotenv import load_dotenv
 from workers import workers_bp
 from mess import mess_bp
-from werkzeug.security import generate_password_hash, check_password_hash
-from bus_timetable import bus_bp
+from bus_timetable import bus_bp, BusTimetable
 from medical import medical_bp
-import requests
-import json
+from events import events_bp, broker
+from sync import sync_bp
+from bulk_import import import_bp
+from export import export_bp
+import search
+import serializers
 import re
+import base64
+import shutil
+import tempfile
 
 load_dotenv()
 
-app = Flask(__name__)
-CORS(app, supports_credentials=True, expose_headers=["Authorization"], origins=["http://localhost:8080"])
-
 basedir = os.path.abspath(os.path.dirname(__file__))
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(basedir, "database.db")
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-
-app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY")
-app.config["JWT_ACCESS_TOKEN_EXPIRES"] = datetime.timedelta(minutes=2000)
-app.config["JWT_REFRESH_TOKEN_EXPIRES"] = datetime.timedelta(days=7)
-
-db.init_app(app)
-Migrate(app, db)
-JWTManager(app)
-
-app.register_blueprint(auth_bp)
-app.register_blueprint(workers_bp)
-app.register_blueprint(issues_bp)
-app.register_blueprint(notices_bp)
-app.register_blueprint(mess_bp)
-app.register_blueprint(bus_bp)
-app.register_blueprint(medical_bp)
-
-@app.get("/api/categories")
+
+# App-level routes and CLI commands; cli_group=None keeps the commands top-level (flask init-db).
+core_bp = Blueprint("core", __name__, cli_group=None)
+
+
+def create_app(config=None):
+    """
+    Build and configure the app. ``flask --app app ...`` finds this factory on
+    its own; servers import the instance from wsgi.py. ``config`` overrides
+    the environment-derived settings.
+    """
+    app = Flask(__name__)
+    CORS(app, supports_credentials=True, expose_headers=["Authorization", "X-Next-Cursor"], origins=["http://localhost:8080"])
+
+    app.config["SQLALCHEMY_DATABASE_URI"] = db_config.database_uri("sqlite:///" + os.path.join(basedir, "database.db"))
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = db_config.engine_options(app.config["SQLALCHEMY_DATABASE_URI"])
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SQLITE_PRAGMAS"] = db_config.sqlite_pragmas()
+
+    app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY")
+    app.config["JWT_ACCESS_TOKEN_EXPIRES"] = datetime.timedelta(minutes=2000)
+    app.config["JWT_REFRESH_TOKEN_EXPIRES"] = datetime.timedelta(days=7)
+
+    app.config["CACHE_BACKEND"] = os.getenv("CACHE_BACKEND", "memory")  # memory | file | null
+    app.config["CACHE_DIR"] = os.getenv("CACHE_DIR")
+    app.config["CACHE_TTL"] = int(os.getenv("CACHE_TTL", "300"))
+    app.config["CACHE_MAX_ENTRIES"] = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    app.config["USER_CACHE_TTL"] = int(os.getenv("USER_CACHE_TTL", "60"))  # 0 disables the user cache
+
+    app.config["PASSWORD_HASH_METHOD"] = os.getenv("PASSWORD_HASH_METHOD", "scrypt")  # any werkzeug method, e.g. pbkdf2:sha256:310000
+    app.config["PASSWORD_HASH_WORKERS"] = int(os.getenv("PASSWORD_HASH_WORKERS", "0")) or None  # default: one per CPU
+    app.config["PASSWORD_HASH_POOL"] = os.getenv("PASSWORD_HASH_POOL", "thread")  # thread | process
+    app.config["PASSWORD_HASH_QUEUE"] = int(os.getenv("PASSWORD_HASH_QUEUE", "64"))
+
+    app.config["TRIAGE_ENDPOINT"] = os.getenv("TRIAGE_ENDPOINT", "https://api.perplexity.ai/chat/completions")
+    app.config["TRIAGE_API_KEY"] = os.getenv("API_KEY")
+    app.config["TRIAGE_TIMEOUT"] = float(os.getenv("TRIAGE_TIMEOUT", "15"))
+    app.config["TRIAGE_WORKERS"] = int(os.getenv("TRIAGE_WORKERS", "4"))
+    app.config["TRIAGE_CACHE_TTL"] = int(os.getenv("TRIAGE_CACHE_TTL", str(24 * 3600)))
+    app.config["TRIAGE_ENGINE"] = os.getenv("TRIAGE_ENGINE", "fallback")  # api | local | fallback | first-pass
+    app.config["TRIAGE_MODEL_PATH"] = os.getenv("TRIAGE_MODEL_PATH", os.path.join(basedir, "triage_model.json"))
+
+    app.config["DUPLICATE_THRESHOLD"] = float(os.getenv("DUPLICATE_THRESHOLD", "0.4"))  # word overlap (Jaccard) to flag
+    app.config["DUPLICATE_WINDOW_DAYS"] = int(os.getenv("DUPLICATE_WINDOW_DAYS", "30"))
+
+    # JSON object mapping issue category -> WorkerInfo.worker_type, for categories whose
+    # workers are registered under a different type name.
+    app.config["ASSIGN_CATEGORY_TYPES"] = json.loads(os.getenv("ASSIGN_CATEGORY_TYPES", "{}"))
+
+    app.config["JSON_ENGINE"] = os.getenv("JSON_ENGINE", "auto")  # auto (orjson when installed) | orjson | stdlib
+
+    app.config["COMPRESS_ENABLED"] = os.getenv("COMPRESS_ENABLED", "1") != "0"
+    app.config["COMPRESS_MIN_SIZE"] = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))  # bytes; smaller bodies go out as they are
+    app.config["COMPRESS_LEVEL"] = int(os.getenv("COMPRESS_LEVEL", "6"))  # gzip, 1-9
+    app.config["COMPRESS_BROTLI_QUALITY"] = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))  # 0-11, used when brotli is installed
+    app.config["COMPRESS_CACHE_ENTRIES"] = int(os.getenv("COMPRESS_CACHE_ENTRIES", "256"))
+
+    app.config["METRICS_ENABLED"] = os.getenv("METRICS_ENABLED", "1") != "0"
+    app.config["METRICS_SLOW_REQUEST_MS"] = float(os.getenv("METRICS_SLOW_REQUEST_MS", "0"))  # 0 disables the slow-request log
+    app.config["METRICS_TOKEN"] = os.getenv("METRICS_TOKEN")  # if set, /metrics needs "Authorization: Bearer <token>"; otherwise an admin JWT
+
+    app.config["EVENTS_POLL_INTERVAL"] = float(os.getenv("EVENTS_POLL_INTERVAL", "0.5"))
+    app.config["EVENTS_HEARTBEAT"] = int(os.getenv("EVENTS_HEARTBEAT", "15"))
+    app.config["EVENTS_MAX_CLIENTS"] = int(os.getenv("EVENTS_MAX_CLIENTS", "100"))
+    app.config["EVENTS_RETENTION_HOURS"] = int(os.getenv("EVENTS_RETENTION_HOURS", "24"))
+    app.config["EVENTS_PRUNE_EVERY"] = int(os.getenv("EVENTS_PRUNE_EVERY", "500"))
+
+    if config:
+        app.config.update(config)
+
+    db.init_app(app)
+    db_config.init_app(app, db)
+    if os.getenv("FLASK_RUN_FROM_CLI") == "true":
+        # Only the flask command needs `flask db`; alembic is slow to import,
+        # so servers never load it.
+        from flask_migrate import Migrate
+        Migrate(app, db, include_object=search.include_object)
+    JWTManager(app)
+    serializers.init_app(app)
+    response_cache.init_app(app)
+    identity.init_app(app)
+    hasher.init_app(app)
+    triage_service.init_app(app)
+    broker.init_app(app)
+    duplicate_index.init_app(app)
+    request_metrics.init_app(app)
+    compressor.init_app(app)  # after metrics, so /metrics counts compressed bytes
+
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(workers_bp)
+    app.register_blueprint(issues_bp)
+    app.register_blueprint(notices_bp)
+    app.register_blueprint(mess_bp)
+    app.register_blueprint(bus_bp)
+    app.register_blueprint(medical_bp)
+    app.register_blueprint(events_bp)
+    app.register_blueprint(sync_bp)
+    app.register_blueprint(import_bp)
+    app.register_blueprint(export_bp)
+    app.register_blueprint(search.search_bp)
+    app.register_blueprint(assignment_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(core_bp)
+    return app
+
+
+def after_fork(app):
+    """
+    Called in each worker after the server forks a preloaded app (see
+    gunicorn.conf.py). Pooled connections and thread pools created in the
+    parent must not be shared with the children, so every worker gets its own.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    hasher.init_app(app)
+    triage_service.init_app(app)
+
+
+@core_bp.get("/api/categories")
+@response_cache.cached("categories")
 def get_categories():
-    return jsonify([
-        {"id": "1", "name": "Room Cleaning"},
-        {"id": "2", "name": "Water Complaint"},
-        {"id": "3", "name": "Internet"},
-        {"id": "4", "name": "Furniture"},
-        {"id": "5", "name": "Electronics"},
-        {"id": "6", "name": "Washroom"},
-        {"id": "7", "name": "Others"},
-    ])
-
-@app.route('/api/analytics')
+    return jsonify(CATEGORIES)
+
+@core_bp.get("/api/cache/stats")
+@role_required("admin")
+def cache_stats():
+    return jsonify({**response_cache.stats, "compression": compressor.stats})
+
+@core_bp.route('/api/analytics')
 def analytics():
     total_users = int(db.session.query(func.count(User.id)).scalar() or 0)
     total_students = int(db.session.query(func.count(User.id)).filter(User.role == 'student').scalar() or 0)
     total_staff = int(db.session.query(func.count(User.id)).filter(User.role != 'student').scalar() or 0)
     total_workers = int(db.session.query(func.count(WorkerInfo.id)).scalar() or 0)
 
-    total_notices = int(db.session.query(func.count(Notice.id)).scalar() or 0)
+    total_notices = int(db.session.query(func.sum(NoticeMonthlyStat.count)).scalar() or 0)
     total_doctors = int(db.session.query(func.count(Doctor.id)).scalar() or 0)
     doctors_available_today = int(db.session.query(func.count(Doctor.id)).filter(Doctor.available_today == True).scalar() or 0)
     student_medical = int(db.session.query(func.count(StudentMedical.id)).scalar() or 0)
 
-    issues_by_status_q = db.session.query(Issue.status, func.count(Issue.id)).group_by(Issue.status).all()
-    issues_by_status = [{'status': s or 'Unknown', 'count': int(c)} for s, c in issues_by_status_q]
+    # Issue and notice figures come from the rollup tables maintained by the
+    # write handlers (see rollups.py), so this never scans Issue or Notice.
+    status_counts = dict(
+        db.session.query(IssueDailyStat.status, func.sum(IssueDailyStat.count))
+        .group_by(IssueDailyStat.status).all()
+    )
+    issues_by_status = [{'status': s or 'Unknown', 'count': int(c)} for s, c in status_counts.items() if c]
 
     today = datetime.date.today()
     start = today - datetime.timedelta(days=29)
 
-    issues_30_q = db.session.query(func.date(Issue.created_at), func.count(Issue.id)) \
-        .filter(Issue.created_at >= start) \
-        .group_by(func.date(Issue.created_at)) \
-        .order_by(func.date(Issue.created_at)).all()
-
-    date_map = {}
-    for d, c in issues_30_q:
-        if d is None:
-            continue
-        if hasattr(d, "isoformat"):
-            key = d.isoformat()
-        else:
-            key = str(d)
-        date_map[key] = int(c)
+    issues_30_q = db.session.query(IssueDailyStat.day, func.sum(IssueDailyStat.count)) \
+        .filter(IssueDailyStat.day >= start) \
+        .group_by(IssueDailyStat.day).all()
+    date_map = {d.isoformat(): int(c) for d, c in issues_30_q}
 
     issues_last_30_days = []
     for i in range(30):
@@ -95,35 +204,26 @@ def analytics():
         key = dd.isoformat()
         issues_last_30_days.append({'date': key, 'count': date_map.get(key, 0)})
 
-    try:
-        first_month = (today.replace(day=1) - datetime.timedelta(days=365)).replace(day=1)
-        notices_q = db.session.query(func.strftime('%Y-%m', Notice.created_at), func.count(Notice.id)) \
-            .filter(Notice.created_at >= first_month) \
-            .group_by(func.strftime('%Y-%m', Notice.created_at)) \
-            .order_by(func.strftime('%Y-%m', Notice.created_at)).all()
-        notices_last_12_months = [{'month': m, 'count': int(c)} for m, c in notices_q]
-    except Exception:
-        first_month = (today.replace(day=1) - datetime.timedelta(days=365)).replace(day=1)
-        notices_q = db.session.query(func.to_char(Notice.created_at, 'YYYY-MM'), func.count(Notice.id)) \
-            .filter(Notice.created_at >= first_month) \
-            .group_by(func.to_char(Notice.created_at, 'YYYY-MM')) \
-            .order_by(func.to_char(Notice.created_at, 'YYYY-MM')).all()
-        notices_last_12_months = [{'month': m, 'count': int(c)} for m, c in notices_q]
-
-    top_reporters_q = db.session.query(Issue.created_by, func.count(Issue.id)) \
-        .group_by(Issue.created_by) \
-        .order_by(func.count(Issue.id).desc()) \
+    first_month = (today.replace(day=1) - datetime.timedelta(days=365)).replace(day=1)
+    notices_q = NoticeMonthlyStat.query \
+        .filter(NoticeMonthlyStat.month >= first_month.strftime('%Y-%m'), NoticeMonthlyStat.count > 0) \
+        .order_by(NoticeMonthlyStat.month).all()
+    notices_last_12_months = [{'month': n.month, 'count': n.count} for n in notices_q]
+
+    top_reporters_q = ReporterStat.query \
+        .filter(ReporterStat.count > 0) \
+        .order_by(ReporterStat.count.desc()) \
         .limit(10).all()
-    top_reporters = [{'reporter': (r or 'Unknown'), 'count': int(c)} for r, c in top_reporters_q]
+    top_reporters = [{'reporter': (r.reporter or 'Unknown'), 'count': r.count} for r in top_reporters_q]
 
     totals = {
         'users': total_users,
         'students': total_students,
         'staff': total_staff,
         'workers': total_workers,
-        'open_issues': int(db.session.query(func.count(Issue.id)).filter(Issue.status == 'Pending').scalar() or 0),
-        'inprogress_issues': int(db.session.query(func.count(Issue.id)).filter(Issue.status == 'In Progress').scalar() or 0),
-        'resolved_issues': int(db.session.query(func.count(Issue.id)).filter(Issue.status == 'Resolved').scalar() or 0),
+        'open_issues': int(status_counts.get('Pending') or 0),
+        'inprogress_issues': int(status_counts.get('In Progress') or 0),
+        'resolved_issues': int(status_counts.get('Resolved') or 0),
         'notices': total_notices,
         'doctors': total_doctors,
         'doctors_available_today': doctors_available_today,
@@ -139,97 +239,240 @@ def analytics():
 
     return jsonify({'totals': totals, 'series': series})
 
-@app.route('/analyze_issue', methods=['POST'])
+@core_bp.route('/analyze_issue', methods=['POST'])
 def analyze_issue():
-    API_KEY = os.getenv("API_KEY")
-    ENDPOINT = "https://api.perplexity.ai/chat/completions"
+    """
+    Queue sentiment/priority analysis. Returns the result straight away when
+    it is cached, otherwise 202 with a key to poll at GET /analyze_issue/<key>.
+    Passing issue_id re-triages that issue from its stored title and
+    description and saves the result; this needs the reporter's or an
+    admin's token.
+    """
+    data = request.get_json(silent=True) or {}
+    issue_id = data.get("issue_id")
+    if issue_id is None:
+        key = triage_service.submit(data.get("title", ""), data.get("description", ""))
+        return analyze_issue_result(key)
+
+    verify_jwt_in_request()
+    issue = Issue.query.get(issue_id) if isinstance(issue_id, int) else None
+    if issue is None:
+        return jsonify({"error": "Issue not found"}), 404
+    if identity.current_identity().role != "admin" and not identity.is_owner(issue):
+        return jsonify({"error": "Forbidden"}), 403
+    key = triage_service.submit(issue.title, issue.description, issue.id)
+    return analyze_issue_result(key)
+
+@core_bp.get('/analyze_issue/<key>')
+def analyze_issue_result(key):
+    state, result = triage_service.status(key)
+    if state == "done":
+        return jsonify(result)
+    if state == "pending":
+        return jsonify({"status": "pending", "key": key, **(result or {})}), 202
+    if state == "failed":
+        return jsonify(DEFAULT_RESULT), 500
+    return jsonify({"error": "Unknown analysis key"}), 404
+
+@core_bp.cli.command("check-query-plans")
+def check_query_plans():
+    """Fail if the hot list endpoints fall back to full table scans (SQLite only)."""
+    if db.engine.dialect.name != "sqlite":
+        print("check-query-plans only understands SQLite plans")
+        return
+    db.create_all()
+
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    def token(role):
+        return {"Authorization": "Bearer " + create_access_token(identity="0", additional_claims={"role": role})}
+
+    cursor = base64.urlsafe_b64encode(f"{datetime.datetime.utcnow().isoformat()}|1".encode()).decode()
+    client = current_app.test_client()
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        for path in ("/api/issues", "/api/issues?status=Pending", "/api/issues?assignee=1",
+                     "/api/issues?created_by=x", "/api/issues?room=1", f"/api/issues?cursor={cursor}"):
+            client.get(path, headers=token("student"))
+        client.get("/api/my-issues", headers=token("worker"))
+        StudentMedical.query.filter_by(email="x").first()
+        BusTimetable.query.filter_by(route_name="x").first()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    full_scan = re.compile(r"^SCAN (TABLE )?(issue|student_medical|bus_timetable)\b(?! USING)")
+    failures = []
+    with db.engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+            bad = [d for d in plan if full_scan.match(d) or "TEMP B-TREE FOR ORDER BY" in d]
+            if bad:
+                failures.append((statement, bad))
+
+    for statement, bad in failures:
+        print(" ".join(statement.split()))
+        print("  ->", "; ".join(bad))
+    if failures:
+        raise SystemExit(1)
+    print(f"{len(statements)} statements checked, all use indexes")
+
+@core_bp.cli.command("check-query-counts")
+@click.option("--issues", "many", default=50, show_default=True, help="Issues in the larger list")
+def check_query_counts(many):
+    """Fail if the issue lists run more SQL statements for many issues than for one (N+1 queries)."""
+    workdir = tempfile.mkdtemp(prefix="query-counts-")
+    uri = "sqlite:///" + os.path.join(workdir, "counts.db")
+    app = create_app({"SQLALCHEMY_DATABASE_URI": uri, "SQLALCHEMY_ENGINE_OPTIONS": db_config.engine_options(uri)})
+    paths = {"student": ("/api/issues?limit=200", "/api/sync"), "worker": ("/api/my-issues",)}
+
+    def seed(n):
+        # 2n issues: half with assignees of their own, half for one worker's
+        # /api/my-issues; n of them upvoted by different students.
+        workers = [User(full_name=f"Worker {i}", email=f"w{n}-{i}@x", password_hash="-", role="worker") for i in range(n + 1)]
+        voters = [User(full_name=f"Student {i}", email=f"s{n}-{i}@x", password_hash="-", role="student") for i in range(n)]
+        db.session.add_all(workers + voters)
+        db.session.flush()
+        issues = [Issue(title="Internet", description="wifi down", room_number=str(i), created_by=v.full_name,
+                        assigned_to=(workers[0] if i % 2 else w).id, upvotes=1, change_seq=i + 1)
+                  for i, (w, v) in enumerate(zip(workers[1:] * 2, voters * 2))]
+        db.session.add_all(issues)
+        db.session.flush()
+        db.session.add_all(IssueVote(issue_id=i.id, user_id=v.id) for i, v in zip(issues, voters))
+        db.session.commit()
+        return {"student": voters[0].id, "worker": workers[0].id}
+
+    def count(n):
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            users = seed(n)
+            client = app.test_client()
+            counts = {}
+            for role, role_paths in paths.items():
+                token = create_access_token(identity=str(users[role]), additional_claims={"role": role})
+                for path in role_paths:
+                    executed = []
+                    listener = lambda *args: executed.append(args[2])
+                    event.listen(db.engine, "before_cursor_execute", listener)
+                    try:
+                        resp = client.get(path, headers={"Authorization": "Bearer " + token})
+                    finally:
+                        event.remove(db.engine, "before_cursor_execute", listener)
+                    if resp.status_code != 200:
+                        raise SystemExit(f"{path} answered {resp.status_code}")
+                    counts[path] = len(executed)
+            return counts
 
     try:
-        data = request.get_json()
-        title = data.get("title", "")
-        description = data.get("description", "")
-        text = f"Title: {title}\nDescription: {description}"
-
-        prompt = (
-            "Analyze the following issue and return only a valid JSON object with two keys: "
-            "'sentiment' and 'priority'.\n"
-            "Sentiment must be exactly one of ['Happy', 'Sad', 'Angry'].\n"
-            "Priority must be exactly one of ['High', 'Medium', 'Low'].\n"
-            "No explanations, no extra text.\n\n"
-            f"Issue:\n{text}"
-        )
-
-        payload = {
-            "model": "sonar",
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.3,
-            "max_tokens": 50,
-            "return_citations": False
-        }
-
-        headers = {
-            "Authorization": f"Bearer {API_KEY}",
-            "Content-Type": "application/json"
-        }
-
-        try:
-            resp = requests.post(ENDPOINT, headers=headers, json=payload, timeout=15)
-            resp.raise_for_status()
-            result = resp.json()
-            content = result["choices"][0]["message"]["content"].strip()
-
-            # For testing (remove this block when using real API)
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            return jsonify({"sentiment": "Happy", "priority": "Low"}), 500
-
-        # --- CLEAN & PARSE ---
-        content = content.strip()
-        content = re.sub(r"^```(?:json)?", "", content)
-        content = re.sub(r"```$", "", content)
-        content = re.sub(r"^'''(?:json)?", "", content)
-        content = re.sub(r"'''$", "", content)
-        content = content.strip()
-
-        match = re.search(r"\{[\s\S]*\}", content)
-        if match:
-            content = match.group(0).strip()
-
-        try:
-            parsed = json.loads(content)
-            sentiment = parsed.get("sentiment", "Happy")
-            priority = parsed.get("priority", "Low")
-        except Exception as e:
-            print("⚠️ JSON parse failed:", e)
-            print("Problematic content:", repr(content))
-            sentiment, priority = "Happy", "Low"
-
-        # Validate model output strictly
-        if sentiment not in ["Happy", "Sad", "Angry"]:
-            sentiment = "Happy"
-        if priority not in ["High", "Medium", "Low"]:
-            priority = "Low"
-
-        return jsonify({"sentiment": sentiment, "priority": priority})
-
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return jsonify({"sentiment": "Happy", "priority": "Low"}), 500
+        one, lots = count(1), count(many)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    failed = False
+    for path in one:
+        grew = lots[path] > one[path]
+        failed |= grew
+        print(f"{path:<24}{one[path]:>4} statements for 1 issue, {lots[path]:>4} for {many}{'  <- N+1' if grew else ''}")
+    if failed:
+        raise SystemExit(1)
+
+@core_bp.cli.command("train-triage")
+def train_triage():
+    """Fit the local triage classifier on issues the remote model has labelled."""
+    samples = db.session.query(Issue.title, Issue.description, Issue.sentiment, Issue.priority) \
+        .filter(Issue.triage_source == "api", Issue.sentiment.isnot(None), Issue.priority.isnot(None)).all()
+    if not samples:
+        print("No API-labelled issues to train on")
+        return
+    clf = LocalClassifier().fit(samples)
+    clf.save(current_app.config["TRIAGE_MODEL_PATH"])
+    triage_service.classifier = clf
+    print(f"Trained on {len(samples)} issues, saved to {current_app.config['TRIAGE_MODEL_PATH']}")
+
+@core_bp.cli.command("rebuild-rollups")
+def rebuild_rollups():
+    """Recompute the analytics rollup tables from existing issues and notices."""
+    db.create_all()
+    rollups.rebuild()
+    print("Analytics rollups rebuilt")
+
+@core_bp.cli.command("rebuild-search-index")
+def rebuild_search_index():
+    """Recreate the full-text search index over issues and notices (SQLite only)."""
+    if db.engine.dialect.name != "sqlite":
+        print("Full-text index is only used on SQLite; nothing to do")
+        return
+    db.create_all()
+    with db.engine.begin() as connection:
+        search.rebuild_index(connection)
+    print("Search index rebuilt")
+
+@core_bp.cli.command("prune-events")
+def prune_events():
+    """Delete events older than EVENTS_RETENTION_HOURS from the event log."""
+    deleted = broker.prune()
+    db.session.commit()
+    print(f"Pruned {deleted} events")
+
+@core_bp.cli.command("auto-assign")
+@click.option("--limit", type=int, default=None, help="Stop after this many issues")
+@click.option("--dry-run", is_flag=True, help="Report decisions without saving them")
+def auto_assign_command(limit, dry_run):
+    """Assign the unassigned backlog to the least-loaded matching workers."""
+    summary = auto_assign(limit=limit, dry_run=dry_run)
+    print(f"Assigned {summary['assigned']}, skipped {summary['skipped']}")
+    for category, count in summary["unmatched"].items():
+        print(f"  no worker for {category}: {count}")
+
+@core_bp.cli.command("backfill-votes")
+def backfill_votes():
+    """Copy the legacy comma-joined issue.voters column into issue_vote and recount upvotes."""
+    db.create_all()
+    if "voters" not in {c["name"] for c in inspect(db.engine).get_columns("issue")}:
+        print("issue.voters column not present, nothing to backfill")
+        return
+
+    rows = db.session.execute(text("SELECT id, voters FROM issue WHERE voters IS NOT NULL AND voters != ''")).all()
+    emails = {e for _, voters in rows for e in voters.split(",") if e}
+    user_ids = dict(db.session.query(User.email, User.id).filter(User.email.in_(emails)).all())
+    existing = set(db.session.query(IssueVote.issue_id, IssueVote.user_id).all())
+
+    added = 0
+    for issue_id, voters in rows:
+        for email in filter(None, voters.split(",")):
+            user_id = user_ids.get(email)
+            if user_id and (issue_id, user_id) not in existing:
+                db.session.add(IssueVote(issue_id=issue_id, user_id=user_id))
+                existing.add((issue_id, user_id))
+                added += 1
+    db.session.flush()
+
+    vote_count = db.session.query(func.count(IssueVote.id)).filter(IssueVote.issue_id == Issue.id).scalar_subquery()
+    Issue.query.update({Issue.upvotes: vote_count}, synchronize_session=False)
+    db.session.commit()
+    print(f"Backfilled {added} votes from {len(rows)} issues")
+
+@core_bp.cli.command("init-db")
+@click.option("--admin-email", default="admin@hostel.com", show_default=True)
+@click.option("--admin-password", default="admin123", show_default=True)
+def init_db(admin_email, admin_password):
+    """Create missing tables and, if there is no admin yet, the first admin account."""
+    db.create_all()
+    if User.query.filter_by(role="admin").first():
+        print("Tables ready; an admin already exists")
+        return
+    db.session.add(User(
+        full_name="Admin",
+        email=admin_email,
+        password_hash=hasher.hash(admin_password),
+        role="admin"
+    ))
+    db.session.commit()
+    print(f"Tables ready; created admin {admin_email}")
 
 if __name__ == "__main__":
-    with app.app_context():
-        db.create_all()
-        admin = User.query.filter_by(role="admin").first()
-        if not admin:
-            new_admin = User(
-                full_name="Admin",
-                email="admin@hostel.com",
-                password_hash=generate_password_hash("admin123"),
-                role="admin"
-            )
-            db.session.add(new_admin)
-            db.session.commit()
-
-    app.run(debug=True, port=5000)
+    # Development server only; run flask init-db once first. See gunicorn.conf.py for production.
+    create_app().run(debug=True, port=5000)
@@ -0,0 +1,192 @@
+import datetime
+import heapq
+import itertools
+from collections import defaultdict
+from flask import Blueprint, current_app, request, jsonify
+from sqlalchemy import func
+from model import db, Issue, User, WorkerInfo, AssignmentLog
+from issues import role_required
+from duplicates import OPEN_STATUSES
+from versions import next_seq
+from serializers import ASSIGNMENT_LOG
+import events
+
+assignment_bp = Blueprint("assignment", __name__, url_prefix="/api")
+
+# Issue categories (the frontend stores the chosen one as the issue title).
+CATEGORIES = [
+    {"id": "1", "name": "Room Cleaning"},
+    {"id": "2", "name": "Water Complaint"},
+    {"id": "3", "name": "Internet"},
+    {"id": "4", "name": "Furniture"},
+    {"id": "5", "name": "Electronics"},
+    {"id": "6", "name": "Washroom"},
+    {"id": "7", "name": "Others"},
+]
+CATEGORY_NAMES = frozenset(c["name"] for c in CATEGORIES)
+
+# Worker types tried, in order, when no worker of the category's own type exists.
+FALLBACK_TYPES = ("Others", "General")
+ASSIGN_BATCH_SIZE = 200
+
+
+class LoadIndex:
+    """
+    Open-assignment counts per worker with one min-heap per worker type, so
+    picking the least-loaded worker of a type is O(log workers). Heap entries
+    are never updated in place: a changed load pushes a new entry and stale
+    ones are dropped when they reach the top. Ties go to whoever was picked
+    least recently.
+    """
+
+    def __init__(self):
+        self.load = {}
+        self.worker_type = {}
+        self._heaps = defaultdict(list)
+        self._tick = itertools.count()
+
+    def add_worker(self, worker_id, worker_type, load=0):
+        self.load[worker_id] = load
+        self.worker_type[worker_id] = worker_type
+        heapq.heappush(self._heaps[worker_type], (load, next(self._tick), worker_id))
+
+    def least_loaded(self, worker_type):
+        heap = self._heaps.get(worker_type)
+        while heap:
+            load, _, worker_id = heap[0]
+            if self.load.get(worker_id) == load:
+                return worker_id
+            heapq.heappop(heap)
+        return None
+
+    def _change(self, worker_id, delta):
+        self.load[worker_id] += delta
+        heap = self._heaps[self.worker_type[worker_id]]
+        heapq.heappush(heap, (self.load[worker_id], next(self._tick), worker_id))
+        if len(heap) > 4 * len(self.load) + 64:
+            # Keep stale entries from piling up on long runs.
+            live = [e for e in heap if self.load.get(e[2]) == e[0]]
+            heapq.heapify(live)
+            self._heaps[self.worker_type[worker_id]] = live
+
+    def assign(self, worker_id):
+        self._change(worker_id, 1)
+
+    def release(self, worker_id):
+        self._change(worker_id, -1)
+
+    def pick(self, category, category_types=None):
+        """Least-loaded worker for ``category``; returns (worker_id, worker_type) or (None, None)."""
+        own = (category_types or {}).get(category, category)
+        for worker_type in (own, *FALLBACK_TYPES):
+            worker_id = self.least_loaded(worker_type)
+            if worker_id is not None:
+                return worker_id, worker_type
+        return None, None
+
+    @classmethod
+    def from_db(cls):
+        """Workers and their current open assignments, in two queries."""
+        index = cls()
+        loads = dict(
+            db.session.query(Issue.assigned_to, func.count(Issue.id))
+            .filter(Issue.assigned_to.isnot(None), Issue.status.in_(OPEN_STATUSES))
+            .group_by(Issue.assigned_to)
+            .all()
+        )
+        workers = db.session.query(User.id, WorkerInfo.worker_type) \
+            .join(WorkerInfo, WorkerInfo.user_id == User.id).filter(User.role == "worker").all()
+        for worker_id, worker_type in workers:
+            index.add_worker(worker_id, worker_type, loads.get(worker_id, 0))
+        return index
+
+
+def category_of(issue):
+    title = (issue.title or "").strip()
+    return title if title in CATEGORY_NAMES else "Others"
+
+
+def auto_assign(limit=None, dry_run=False, category_types=None, batch_size=ASSIGN_BATCH_SIZE):
+    """
+    Assign the unassigned Pending backlog, oldest first, to the least-loaded
+    eligible workers. ``category_types`` maps a category to the worker type
+    that handles it (default: the type named like the category). Each batch
+    is committed together with its AssignmentLog rows and issue.assigned
+    events. An issue someone assigned by hand in the meantime is left alone.
+    """
+    if category_types is None:
+        category_types = current_app.config.get("ASSIGN_CATEGORY_TYPES") or {}
+    index = LoadIndex.from_db()
+    names = dict(db.session.query(User.id, User.full_name).filter(User.id.in_(index.load)).all()) if index.load else {}
+    summary = {"assigned": 0, "skipped": 0, "byWorker": defaultdict(int), "unmatched": defaultdict(int)}
+    last_id = 0
+    while limit is None or summary["assigned"] + summary["skipped"] < limit:
+        size = batch_size if limit is None else min(batch_size, limit - summary["assigned"] - summary["skipped"])
+        batch = (
+            db.session.query(Issue.id, Issue.title)
+            .filter(Issue.assigned_to.is_(None), Issue.status == "Pending", Issue.id > last_id)
+            .order_by(Issue.id)
+            .limit(size)
+            .all()
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+        decisions = []
+        for issue in batch:
+            category = category_of(issue)
+            worker_id, worker_type = index.pick(category, category_types)
+            if worker_id is None:
+                summary["skipped"] += 1
+                summary["unmatched"][category] += 1
+                continue
+            decisions.append((issue, category, worker_id, worker_type, index.load[worker_id]))
+            index.assign(worker_id)
+
+        if dry_run or not decisions:
+            summary["assigned"] += len(decisions)
+            for _, _, worker_id, _, _ in decisions:
+                summary["byWorker"][worker_id] += 1
+            continue
+
+        now = datetime.datetime.utcnow()
+        seq = next_seq(len(decisions)) - len(decisions)
+        for issue, category, worker_id, worker_type, open_before in decisions:
+            seq += 1
+            updated = Issue.query.filter(Issue.id == issue.id, Issue.assigned_to.is_(None)).update(
+                {Issue.assigned_to: worker_id, Issue.assigned_at: now, Issue.change_seq: seq},
+                synchronize_session=False,
+            )
+            if not updated:
+                index.release(worker_id)
+                summary["skipped"] += 1
+                continue
+            db.session.add(AssignmentLog(issue_id=issue.id, worker_id=worker_id, category=category,
+                                         worker_type=worker_type, open_before=open_before, created_at=now))
+            events.publish("issue.assigned", {"id": issue.id, "assignedTo": worker_id,
+                                              "assigneeName": names.get(worker_id)}, worker_id=worker_id)
+            summary["assigned"] += 1
+            summary["byWorker"][worker_id] += 1
+        db.session.commit()
+    return summary
+
+
+@assignment_bp.post("/issues/auto-assign")
+@role_required("admin")
+def run_auto_assign():
+    """
+    Assign the unassigned backlog. Body (optional): {"limit": n, "dry_run": true}.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        limit = int(data["limit"]) if data.get("limit") is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid limit"}), 400
+    return jsonify(auto_assign(limit=limit, dry_run=bool(data.get("dry_run"))))
+
+
+@assignment_bp.get("/issues/<int:issue_id>/assignment-log")
+@role_required("admin")
+def get_assignment_log(issue_id):
+    rows = AssignmentLog.query.filter_by(issue_id=issue_id).order_by(AssignmentLog.id).all()
+    return jsonify(ASSIGNMENT_LOG.dump_all(rows))
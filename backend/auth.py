@@ -1,13 +1,20 @@
 from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_jwt_extended import (
     create_access_token, create_refresh_token,
-    jwt_required, get_jwt_identity, get_jwt
+    jwt_required, get_jwt
 )
 from model import db, User, WorkerInfo
+from identity import current_identity, get_user, invalidate_user
+from passwords import hasher, HasherBusy
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
+
+@auth_bp.errorhandler(HasherBusy)
+def hasher_busy(e):
+    return jsonify({"error": "Too many sign-ins, try again shortly"}), 503, {"Retry-After": "2"}
+
+
 def _claims(user):
     return {"role": user.role, "email": user.email, "name": user.full_name}
 
@@ -25,7 +32,7 @@ def signup():
         return jsonify({"error": "Email already registered"}), 409
     if role not in ("student",):
         return jsonify({"error": "Invalid role"}), 400
-    user = User(full_name=name, email=email, password_hash=generate_password_hash(pwd), role=role,room_no=roomNo)
+    user = User(full_name=name, email=email, password_hash=hasher.hash(pwd), role=role,room_no=roomNo)
     db.session.add(user)
     db.session.commit()
     return jsonify({"message": "Account created"}), 201
@@ -35,8 +42,11 @@ def login():
     data = request.get_json() or {}
     email, pwd = data.get("email"), data.get("password")
     user = User.query.filter_by(email=email).first()
-    if not user or not check_password_hash(user.password_hash, pwd):
+    if not hasher.verify(user.password_hash if user else None, pwd):
         return jsonify({"error": "Invalid credentials"}), 401
+    if hasher.needs_rehash(user.password_hash):
+        user.password_hash = hasher.hash(pwd)
+        db.session.commit()
 
     access = create_access_token(identity=str(user.id), additional_claims=_claims(user))
     refresh = create_refresh_token(identity=str(user.id), additional_claims=_claims(user))
@@ -63,7 +73,7 @@ def create_worker():
     worker = User(
         full_name=name,
         email=email,
-        password_hash=generate_password_hash(pwd),
+        password_hash=hasher.hash(pwd),
         role="worker"
     )
     db.session.add(worker)
@@ -89,7 +99,9 @@ def create_worker():
 @auth_bp.get("/me")
 @jwt_required()
 def me():
-    user = User.query.get(int(get_jwt_identity()))
+    user = get_user(current_identity().id)
+    if not user:
+        return jsonify({"msg": "User not found"}), 404
     return jsonify({
         "id": user.id,
         "name": user.full_name,
@@ -102,7 +114,7 @@ def me():
 @jwt_required()
 def update_profile():
     
-    user_id = int(get_jwt_identity())
+    user_id = current_identity().id
     data = request.get_json(silent=True) or {}
 
     if not data:
@@ -137,4 +149,5 @@ def update_profile():
             setattr(user, "roomNo", room_no)
 
     db.session.commit()
+    invalidate_user(user_id)
     return jsonify({"msg": "Profile updated"}), 200
\ No newline at end of file
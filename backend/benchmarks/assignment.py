@@ -0,0 +1,74 @@
+"""
+Simulate automatic assignment of a large backlog.
+
+    python -m benchmarks.assignment
+    python -m benchmarks.assignment --workers 50 200 1000 --issues 20000
+
+Workers are spread over the issue categories; issues arrive with a skewed
+category mix and a --resolve fraction of open assignments is completed
+along the way. Reports microseconds per decision for LoadIndex and for a
+linear scan over eligible workers, plus how evenly load ended up spread.
+"""
+import argparse
+import random
+import statistics
+import time
+from assignment import CATEGORIES, FALLBACK_TYPES, LoadIndex
+
+CATEGORY_WEIGHTS = [12, 30, 20, 8, 15, 12, 3]
+
+
+class LinearIndex(LoadIndex):
+    """Baseline: scan every worker of the type on each pick."""
+
+    def least_loaded(self, worker_type):
+        eligible = [w for w, t in self.worker_type.items() if t == worker_type]
+        return min(eligible, key=self.load.__getitem__, default=None)
+
+    def _change(self, worker_id, delta):
+        self.load[worker_id] += delta
+
+
+def simulate(index_cls, workers, issues, resolve, seed):
+    rng = random.Random(seed)
+    names = [c["name"] for c in CATEGORIES]
+    index = index_cls()
+    for w in range(workers):
+        index.add_worker(w, names[w % len(names)] if w % 10 else FALLBACK_TYPES[0])
+    stream = rng.choices(names, CATEGORY_WEIGHTS, k=issues)
+    open_assignments = []
+
+    start = time.perf_counter()
+    for category in stream:
+        worker_id, _ = index.pick(category)
+        index.assign(worker_id)
+        open_assignments.append(worker_id)
+        if rng.random() < resolve:
+            done = open_assignments.pop(rng.randrange(len(open_assignments)))
+            index.release(done)
+    elapsed = time.perf_counter() - start
+
+    spread = {}
+    for worker_type in set(index.worker_type.values()):
+        loads = [index.load[w] for w, t in index.worker_type.items() if t == worker_type]
+        spread[worker_type] = max(loads) - min(loads)
+    return elapsed / issues * 1e6, max(spread.values()), statistics.pstdev(index.load.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[20, 100, 500, 2000])
+    parser.add_argument("--issues", type=int, default=10000)
+    parser.add_argument("--resolve", type=float, default=0.5, help="chance an open assignment completes per new issue")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8}{'heap us/pick':>14}{'linear us/pick':>16}{'max spread':>12}{'load stdev':>12}")
+    for workers in args.workers:
+        heap_us, spread, stdev = simulate(LoadIndex, workers, args.issues, args.resolve, args.seed)
+        linear_us, _, _ = simulate(LinearIndex, workers, args.issues, args.resolve, args.seed)
+        print(f"{workers:>8}{heap_us:>14.2f}{linear_us:>16.2f}{spread:>12}{stdev:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
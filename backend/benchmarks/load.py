@@ -0,0 +1,397 @@
+"""
+Seed a throwaway SQLite database and drive mixed workloads against the app.
+
+    python -m benchmarks.load                                   # every scenario, test client
+    python -m benchmarks.load --scenario mixed --threads 8 --duration 20
+    python -m benchmarks.load --students 5000 --issues 50000 --serve
+    python -m benchmarks.load --save benchmarks/load_baseline.json
+    python -m benchmarks.load --baseline benchmarks/load_baseline.json --tolerance 0.25
+
+Scenarios:
+    dashboard   students opening the dashboard (every list the frontend loads)
+    storm       students filing issues and toggling upvotes
+    polling     workers polling /api/my-issues
+    analytics   admins loading /api/analytics
+    mixed       all of the above, weighted like a normal day
+
+Requests go through the Flask test client by default; --serve starts a
+threaded werkzeug server on a free local port and talks HTTP to it
+instead. Each scenario runs --threads virtual users for --duration
+seconds after a short warm-up, then prints throughput and p50/p95/p99
+latency per endpoint.
+
+--save writes the results as JSON; --baseline compares against such a
+file and exits 1 when an endpoint's p95 grew, or its throughput fell,
+by more than --tolerance. Baselines are only comparable on the same
+machine with the same seed arguments.
+"""
+import argparse
+import datetime
+import http.client
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+WORDS = (
+    "leak tap water cold hot shower drain blocked smell broken window door lock "
+    "fan light bulb switch socket plug wifi router slow signal chair table bed "
+    "mattress cupboard shelf wall paint damp mould ceiling floor tile crack dirty "
+    "dust bin overflowing sink toilet flush pipe noise loud heater geyser ac "
+    "remote mosquito net curtain rod hinge handle key corridor stairs lift"
+).split()
+CATEGORY_NAMES = ["Room Cleaning", "Water Complaint", "Internet", "Furniture", "Electronics", "Washroom", "Others"]
+DASHBOARD_PATHS = ("/auth/me", "/api/issues", "/api/categories", "/api/notices", "/api/mess",
+                   "/api/medical/doctors", "/api/timetable")
+OK_STATUSES = {200, 201, 304, 409}  # 409: duplicate warning on issue create
+
+
+def describe(rng):
+    return " ".join(rng.choices(WORDS, k=rng.randint(8, 16)))
+
+
+def seed(app, args):
+    """Bulk-insert the synthetic dataset; returns the ids the workloads need."""
+    from sqlalchemy import insert
+    from model import db, User, WorkerInfo, Issue, IssueVote, Notice, Doctor, Mess
+    from bus_timetable import BusTimetable
+    import rollups
+
+    rng = random.Random(args.seed)
+    now = time.time()
+    days = args.days * 86400
+
+    def when():
+        return datetime.datetime.utcfromtimestamp(now - rng.random() * days)
+
+    with app.app_context():
+        db.create_all()
+        users = [{"full_name": f"Student {i}", "email": f"student{i}@bench.local", "password_hash": "-",
+                  "role": "student", "room_no": str(100 + i % 400)} for i in range(args.students)]
+        users += [{"full_name": f"Worker {i}", "email": f"worker{i}@bench.local", "password_hash": "-",
+                   "role": "worker"} for i in range(args.workers)]
+        users.append({"full_name": "Bench Admin", "email": "admin@bench.local", "password_hash": "-", "role": "admin"})
+        db.session.execute(insert(User), users)
+        ids = {role: [i for (i,) in db.session.query(User.id).filter(User.role == role).order_by(User.id)]
+               for role in ("student", "worker", "admin")}
+        names = dict(db.session.query(User.id, User.full_name))
+
+        db.session.execute(insert(WorkerInfo), [
+            {"user_id": w, "worker_type": CATEGORY_NAMES[n % len(CATEGORY_NAMES)]}
+            for n, w in enumerate(ids["worker"])
+        ])
+
+        statuses = ["Pending"] * 3 + ["In Progress"] * 2 + ["Resolved"] * 5
+        issues = []
+        for n in range(args.issues):
+            reporter = rng.choice(ids["student"])
+            status = rng.choice(statuses)
+            assigned = rng.choice(ids["worker"]) if status != "Pending" and ids["worker"] else None
+            issues.append({
+                "title": rng.choice(CATEGORY_NAMES), "description": describe(rng),
+                "room_number": str(100 + reporter % 400), "status": status,
+                "created_by": names[reporter], "reporter_id": reporter, "created_at": when(),
+                "upvotes": 0, "assigned_to": assigned, "change_seq": n + 1,
+                "sentiment": rng.choice(["positive", "neutral", "negative"]),
+                "priority": rng.choice(["low", "medium", "high"]),
+            })
+        for start in range(0, len(issues), 5000):
+            db.session.execute(insert(Issue), issues[start:start + 5000])
+        ids["issue"] = [i for (i,) in db.session.query(Issue.id).order_by(Issue.id)]
+
+        votes, counts = set(), defaultdict(int)
+        while len(votes) < min(args.votes, len(ids["issue"]) * len(ids["student"])):
+            pair = (rng.choice(ids["issue"]), rng.choice(ids["student"]))
+            if pair not in votes:
+                votes.add(pair)
+                counts[pair[0]] += 1
+        rows = [{"issue_id": i, "user_id": u, "created_at": when()} for i, u in votes]
+        for start in range(0, len(rows), 5000):
+            db.session.execute(insert(IssueVote), rows[start:start + 5000])
+        for issue_id, count in counts.items():
+            db.session.query(Issue).filter_by(id=issue_id).update({Issue.upvotes: count}, synchronize_session=False)
+
+        db.session.execute(insert(Notice), [
+            {"title": f"Notice {n}", "content": describe(rng), "created_at": when(), "author": "Admin"}
+            for n in range(args.notices)
+        ])
+        db.session.execute(insert(Doctor), [
+            {"name": f"Dr. {n}", "available_today": n % 2 == 0, "arrival_time": "09:00", "leave_time": "17:00"}
+            for n in range(args.doctors)
+        ])
+        db.session.execute(insert(Mess), [
+            {"day": day, "breakfast": "Idli", "lunch": "Rice", "snacks": "Tea", "dinner": "Roti"}
+            for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+        ])
+        db.session.execute(insert(BusTimetable), [
+            {"route_name": f"Route {n}", "schedule": "08:00, 12:00, 17:00"} for n in range(10)
+        ])
+        db.session.commit()
+        rollups.rebuild()
+        db.session.remove()
+    return ids
+
+
+def tokens(app):
+    from flask_jwt_extended import create_access_token
+    from model import User
+    from auth import _claims
+
+    with app.app_context():
+        users = User.query.filter(User.role.in_(("student", "worker", "admin"))).all()
+        return {u.id: {"Authorization": "Bearer " + create_access_token(identity=str(u.id),
+                                                                        additional_claims=_claims(u))}
+                for u in users}
+
+
+class TestClientTransport:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, headers, body=None):
+        response = self.client.open(path, method=method, headers=headers, json=body)
+        response.close()
+        return response.status_code
+
+
+class HTTPTransport:
+    """One keep-alive connection per virtual user."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+
+    def request(self, method, path, headers, body=None):
+        headers = dict(headers)
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        try:
+            self.conn.request(method, path, body=data, headers=headers)
+            response = self.conn.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            return 0
+
+
+class Workload:
+    """Operations of each scenario; every op returns (endpoint label, method, path, body)."""
+
+    def __init__(self, ids, headers, seed):
+        self.ids = ids
+        self.headers = headers
+        self.rng = random.Random(seed)
+        self.student = self.rng.choice(ids["student"])
+        self.worker = self.rng.choice(ids["worker"]) if ids["worker"] else None
+        self.admin = ids["admin"][0]
+        self.dashboard_step = 0
+
+    def dashboard(self):
+        path = DASHBOARD_PATHS[self.dashboard_step % len(DASHBOARD_PATHS)]
+        self.dashboard_step += 1
+        if self.dashboard_step % len(DASHBOARD_PATHS) == 0:
+            self.student = self.rng.choice(self.ids["student"])
+        return self.student, "GET", path, path, None
+
+    def create(self):
+        self.student = self.rng.choice(self.ids["student"])
+        body = {"title": self.rng.choice(CATEGORY_NAMES), "description": describe(self.rng),
+                "roomNumber": str(100 + self.student % 400), "createdBy": f"Student {self.student}"}
+        return self.student, "POST", "/api/issues", "/api/issues", body
+
+    def upvote(self):
+        # Votes pile onto the newest issues, like a popular complaint does.
+        issue = self.ids["issue"][-1 - min(int(self.rng.expovariate(0.05)), len(self.ids["issue"]) - 1)]
+        user = self.rng.choice(self.ids["student"])
+        return user, "POST", f"/api/issues/{issue}/upvote", "/api/issues/<id>/upvote", None
+
+    def poll(self):
+        self.worker = self.rng.choice(self.ids["worker"])
+        return self.worker, "GET", "/api/my-issues", "/api/my-issues", None
+
+    def analytics(self):
+        return self.admin, "GET", "/api/analytics", "/api/analytics", None
+
+    def scenario(self, name):
+        ops = {
+            "dashboard": [(self.dashboard, 1)],
+            "storm": [(self.create, 1), (self.upvote, 3)],
+            "polling": [(self.poll, 1)],
+            "analytics": [(self.analytics, 1)],
+            "mixed": [(self.dashboard, 70), (self.create, 3), (self.upvote, 10), (self.poll, 15),
+                      (self.analytics, 2)],
+        }[name]
+        funcs, weights = zip(*ops)
+        return lambda: self.rng.choices(funcs, weights)[0]()
+
+
+def percentile(ordered, q):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered) + 0.5) - 1))]
+
+
+def run_scenario(name, make_transport, ids, headers, args):
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    measure_from = time.perf_counter() + args.warmup
+    stop_at = measure_from + args.duration
+
+    def user(n):
+        transport = make_transport()
+        next_op = Workload(ids, headers, args.seed * 1000 + n).scenario(name)
+        local, local_errors = defaultdict(list), defaultdict(int)
+        while True:
+            user_id, method, path, label, body = next_op()
+            start = time.perf_counter()
+            if start >= stop_at:
+                break
+            status = transport.request(method, path, headers[user_id], body)
+            elapsed = time.perf_counter() - start
+            if start < measure_from:
+                continue
+            key = f"{method} {label}"
+            local[key].append(elapsed)
+            if status not in OK_STATUSES:
+                local_errors[key] += 1
+        with lock:
+            for key, values in local.items():
+                samples[key].extend(values)
+            for key, count in local_errors.items():
+                errors[key] += count
+
+    threads = [threading.Thread(target=user, args=(n,)) for n in range(args.threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    results = {}
+    for key in sorted(samples):
+        ordered = sorted(samples[key])
+        results[key] = {
+            "requests": len(ordered),
+            "errors": errors[key],
+            "rps": len(ordered) / args.duration,
+            "p50_ms": percentile(ordered, 0.50) * 1000,
+            "p95_ms": percentile(ordered, 0.95) * 1000,
+            "p99_ms": percentile(ordered, 0.99) * 1000,
+        }
+    everything = sorted(v for values in samples.values() for v in values)
+    results["total"] = {
+        "requests": len(everything),
+        "errors": sum(errors.values()),
+        "rps": len(everything) / args.duration,
+        "p50_ms": percentile(everything, 0.50) * 1000,
+        "p95_ms": percentile(everything, 0.95) * 1000,
+        "p99_ms": percentile(everything, 0.99) * 1000,
+    }
+    return results
+
+
+def report(name, results, baseline, tolerance):
+    """Print one scenario's table; returns the endpoints that regressed."""
+    print(f"\n== {name}")
+    print(f"{'endpoint':<36}{'reqs':>8}{'err':>6}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}  vs baseline")
+    regressions = []
+    for key, r in results.items():
+        note = ""
+        base = (baseline or {}).get(key)
+        if base:
+            p95 = r["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0
+            rps = r["rps"] / base["rps"] - 1 if base["rps"] else 0
+            note = f"p95 {p95:+.0%}, req/s {rps:+.0%}"
+            if p95 > tolerance or rps < -tolerance:
+                note += "  REGRESSION"
+                regressions.append(f"{name}: {key}")
+        print(f"{key:<36}{r['requests']:>8}{r['errors']:>6}{r['rps']:>10.1f}"
+              f"{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}  {note}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", nargs="+", default=["dashboard", "storm", "polling", "analytics", "mixed"],
+                        choices=["dashboard", "storm", "polling", "analytics", "mixed"])
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=30)
+    parser.add_argument("--issues", type=int, default=10000)
+    parser.add_argument("--votes", type=int, default=30000)
+    parser.add_argument("--notices", type=int, default=200)
+    parser.add_argument("--doctors", type=int, default=10)
+    parser.add_argument("--days", type=int, default=180, help="spread created_at over this many days")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threads", type=int, default=4, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=10, help="measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=1, help="unmeasured seconds before each scenario")
+    parser.add_argument("--serve", action="store_true", help="run a local HTTP server instead of the test client")
+    parser.add_argument("--save", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare with results saved by --save")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-load-")
+    os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(workdir, "bench.db"))
+    os.environ.setdefault("JWT_SECRET_KEY", "bench-" + "x" * 32)
+    os.environ.setdefault("TRIAGE_ENGINE", "local")  # keep the remote model out of the numbers
+    try:
+        from app import create_app
+        app = create_app()
+        import logging
+        app.logger.setLevel(logging.ERROR)
+
+        start = time.perf_counter()
+        ids = seed(app, args)
+        print(f"seeded {args.students} students, {args.workers} workers, {args.issues} issues, "
+              f"{args.votes} votes in {time.perf_counter() - start:.1f}s ({os.environ['DATABASE_URL']})")
+        headers = tokens(app)
+
+        server = None
+        if args.serve:
+            from werkzeug.serving import make_server
+            server = make_server("127.0.0.1", 0, app, threaded=True)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{server.server_port}"
+            make_transport = lambda: HTTPTransport(url)
+        else:
+            make_transport = lambda: TestClientTransport(app)
+
+        baseline = {}
+        if args.baseline:
+            with open(args.baseline) as f:
+                saved = json.load(f)
+            if saved.get("args", {}).get("issues") != args.issues or saved.get("args", {}).get("threads") != args.threads:
+                print("warning: baseline was recorded with different --issues/--threads", file=sys.stderr)
+            baseline = saved.get("scenarios", {})
+
+        results, regressions = {}, []
+        for name in args.scenario:
+            results[name] = run_scenario(name, make_transport, ids, headers, args)
+            regressions += report(name, results[name], baseline.get(name), args.tolerance)
+        if server is not None:
+            server.shutdown()
+
+        if args.save:
+            keep = ("students", "workers", "issues", "votes", "notices", "threads", "duration", "serve", "seed")
+            with open(args.save, "w") as f:
+                json.dump({"args": {k: getattr(args, k) for k in keep}, "scenarios": results}, f, indent=2)
+            print(f"\nsaved {args.save}")
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.tolerance:.0%}:", *regressions, sep="\n  ")
+            sys.exit(1)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
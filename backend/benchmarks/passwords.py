@@ -0,0 +1,71 @@
+"""
+Login throughput for password hash settings.
+
+    python -m benchmarks.passwords
+    python -m benchmarks.passwords --methods scrypt:16384:8:1 pbkdf2:sha256:310000 --workers 4
+
+For every method a stored hash is checked over and over, which is the CPU
+cost of one login. Reports single-thread logins/sec (that is, per core)
+and the throughput of a PasswordHasher pool with --workers threads.
+"""
+import argparse
+import os
+import time
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+from passwords import PasswordHasher
+
+DEFAULT_METHODS = [
+    "scrypt:32768:8:1",
+    "scrypt:16384:8:1",
+    "pbkdf2:sha256:1000000",
+    "pbkdf2:sha256:600000",
+    "pbkdf2:sha256:310000",
+]
+
+
+def per_core(stored, seconds):
+    n, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        check_password_hash(stored, "correct horse")
+        n += 1
+    return n / (time.perf_counter() - start)
+
+
+def pooled(method, stored, workers, seconds):
+    hasher = PasswordHasher()
+    hasher.init_app(SimpleNamespace(config={
+        "PASSWORD_HASH_METHOD": method, "PASSWORD_HASH_WORKERS": workers, "PASSWORD_HASH_QUEUE": workers * 4,
+    }))
+    deadline = time.perf_counter() + seconds
+    counts = [0] * (workers * 2)
+
+    def client(i):
+        while time.perf_counter() < deadline:
+            hasher.verify(stored, "correct horse")
+            counts[i] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(len(counts)) as clients:
+        list(clients.map(client, range(len(counts))))
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--methods", nargs="+", default=DEFAULT_METHODS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seconds", type=float, default=3.0, help="measuring time per setting")
+    args = parser.parse_args()
+
+    print(f"{'method':<26}{'ms/login':>10}{'logins/s/core':>15}{f'pool x{args.workers} logins/s':>22}")
+    for method in args.methods:
+        stored = generate_password_hash("correct horse", method)
+        single = per_core(stored, args.seconds)
+        pool = pooled(method, stored, args.workers, args.seconds)
+        print(f"{method:<26}{1000 / single:>10.1f}{single:>15.1f}{pool:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Time turning issue-list rows into a JSON response body.
+
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --rows 50000 --repeat 10
+
+Compares the hand-written dict with isoformat() per datetime and Flask's
+default provider (how handlers worked before serializers.py) with
+serializers.ISSUE plus the stdlib and orjson providers, and with
+stream_array(). Rows are namedtuples shaped like issue_list_query() rows,
+so the database is not part of the numbers. Reports the best of --repeat
+runs, in ms per 10k rows, split into building the dicts and encoding them.
+"""
+import argparse
+import datetime
+import random
+import time
+from collections import namedtuple
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from serializers import ISSUE, JSONProvider, OrjsonProvider, stream_array
+
+Row = namedtuple("Row", "id title description room_number status created_by created_at upvotes "
+                        "assigned_to assigned_at sentiment priority change_seq assignee_name has_voted")
+
+
+def legacy_issue_to_json(i):
+    """issues.issue_to_json as it was before the shared specs."""
+    return {
+        "id": i.id,
+        "title": i.title,
+        "description": i.description,
+        "roomNumber": i.room_number,
+        "status": i.status,
+        "createdBy": i.created_by,
+        "createdAt": i.created_at.isoformat(),
+        "upvotes": i.upvotes,
+        "hasVoted": bool(i.has_voted),
+        "assignedTo": i.assigned_to,
+        "assignedWorker": i.assignee_name,
+        "assignedAt": i.assigned_at.isoformat() if i.assigned_at else None,
+        "assignee": i.assigned_to,
+        "assigneeName": i.assignee_name,
+        "sentiment": i.sentiment,
+        "priority": i.priority,
+        "changeSeq": i.change_seq,
+    }
+
+
+def make_rows(n, seed):
+    rng = random.Random(seed)
+    now = datetime.datetime.utcnow()
+    rows = []
+    for i in range(n):
+        assigned = rng.random() < 0.5
+        rows.append(Row(
+            i, rng.choice(["Internet", "Washroom", "Furniture"]), "water leaking near the window " * 3,
+            str(100 + i % 400), rng.choice(["Pending", "In Progress", "Resolved"]), f"Student {i % 900}",
+            now - datetime.timedelta(minutes=i), rng.randint(0, 40), 7 if assigned else None,
+            now if assigned else None, "negative", "high", i, "Worker 7" if assigned else None, rng.random() < 0.2,
+        ))
+    return rows
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, args.seed)
+    app = Flask(__name__)
+    providers = {"flask default": DefaultJSONProvider(app), "stdlib": JSONProvider(app)}
+    try:
+        providers["orjson"] = OrjsonProvider(app)
+    except ImportError:
+        print("orjson not installed; skipping it")
+
+    per_10k = 10000 / args.rows
+    cases = [("before: dict + isoformat", legacy_issue_to_json, "flask default")]
+    cases += [(f"after: ISSUE spec, {name}", ISSUE.dump, name) for name in ("stdlib", "orjson") if name in providers]
+
+    print(f"{'case':<34}{'build ms':>10}{'encode ms':>11}{'total ms':>10}  (per 10k rows, {args.rows} rows)")
+    with app.app_context():
+        for label, dump, provider_name in cases:
+            provider = providers[provider_name]
+            data = list(map(dump, rows))
+            build = best(lambda: list(map(dump, rows)), args.repeat)
+            encode = best(lambda: provider.response(data).get_data(), args.repeat)
+            print(f"{label:<34}{build * per_10k * 1000:>10.1f}{encode * per_10k * 1000:>11.1f}"
+                  f"{(build + encode) * per_10k * 1000:>10.1f}")
+
+        for name in ("stdlib", "orjson"):
+            if name not in providers:
+                continue
+            app.json = providers[name]
+            with app.test_request_context():
+                total = best(lambda: b"".join(stream_array(rows, ISSUE).iter_encoded()), args.repeat)
+            print(f"{'stream_array, ' + name:<34}{'':>10}{'':>11}{total * per_10k * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
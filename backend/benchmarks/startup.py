@@ -0,0 +1,142 @@
+"""
+Measure cold start: how long a fresh interpreter takes to import the app,
+build it with create_app() and answer its first request.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 20 --budget-ms 700
+    python -m benchmarks.startup --top 15      # slowest imports, from python -X importtime
+
+Every run is a new process against a throwaway SQLite database, so
+nothing is cached between runs except the OS page cache (the first run is
+discarded). The first request is an authenticated GET /api/notices, which
+opens the first database connection.
+
+Exits 1 when the median time from process start to the first response is
+over --budget-ms, or when startup imported a module that is meant to load
+on first use only (DEFERRED).
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Loaded on first use, never at startup: the triage HTTP client, Flask-Migrate
+# (only the flask command registers it) and the PostgreSQL upsert dialect.
+DEFERRED = ("requests", "flask_migrate", "alembic", "sqlalchemy.dialects.postgresql")
+
+CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+import app as app_module
+t1 = time.perf_counter()
+app = app_module.create_app()
+t2 = time.perf_counter()
+with app.app_context():
+    from flask_jwt_extended import create_access_token
+    token = create_access_token(identity="1", additional_claims={"role": "student"})
+t3 = time.perf_counter()
+status = app.test_client().get("/api/notices", headers={"Authorization": "Bearer " + token}).status_code
+t4 = time.perf_counter()
+print(json.dumps({
+    "import": t1 - t0, "create_app": t2 - t1, "first_request": t4 - t3, "status": status,
+    "deferred": [m for m in DEFERRED if m in sys.modules],
+}))
+"""
+
+SETUP = """
+from app import create_app
+from model import db
+with create_app().app_context():
+    db.create_all()
+"""
+
+
+def run_child(code, env):
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if out.returncode:
+        sys.exit(out.stderr)
+    return wall, out
+
+
+def slowest_imports(env, top):
+    """Self time per top-level package and per backend module, from -X importtime."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import wsgi"],
+                         env=env, capture_output=True, text=True)
+    local = {os.path.splitext(f)[0] for f in os.listdir(".") if f.endswith(".py")}
+    totals = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        package = name if name in local else name.split(".")[0]
+        totals[package] = totals.get(package, 0) + int(self_us)
+    return sorted(totals.items(), key=lambda kv: -kv[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=800,
+                        help="limit for the median process start -> first response time")
+    parser.add_argument("--top", type=int, default=0, help="also list the N slowest imports")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-startup-")
+    env = {
+        **os.environ,
+        "DATABASE_URL": "sqlite:///" + os.path.join(workdir, "startup.db"),
+        "JWT_SECRET_KEY": os.getenv("JWT_SECRET_KEY") or "bench-" + "x" * 32,
+    }
+    env.pop("FLASK_RUN_FROM_CLI", None)
+    try:
+        run_child(SETUP, env)
+        code = f"DEFERRED = {DEFERRED!r}\n" + CHILD
+        samples = {"process": [], "import": [], "create_app": [], "first_request": []}
+        deferred = set()
+        for n in range(args.runs + 1):
+            wall, out = run_child(code, env)
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            if result["status"] != 200:
+                sys.exit(f"first request answered {result['status']}")
+            deferred.update(result["deferred"])
+            if n == 0:
+                continue  # warms the page cache and writes .pyc files
+            samples["process"].append(wall)
+            for key in ("import", "create_app", "first_request"):
+                samples[key].append(result[key])
+
+        print(f"{'phase':<16}{'median ms':>10}{'min ms':>9}{'max ms':>9}")
+        for key, values in samples.items():
+            print(f"{key:<16}{statistics.median(values) * 1000:>10.1f}"
+                  f"{min(values) * 1000:>9.1f}{max(values) * 1000:>9.1f}")
+
+        if args.top:
+            print("\nslowest imports (self time, ms):")
+            for name, us in slowest_imports(env, args.top):
+                print(f"  {us / 1000:>7.1f}  {name}")
+
+        failed = False
+        median = statistics.median(samples["process"]) * 1000
+        if median > args.budget_ms:
+            print(f"\nover budget: {median:.0f} ms > {args.budget_ms:.0f} ms")
+            failed = True
+        if deferred:
+            print(f"\nimported at startup but meant to load on first use: {', '.join(sorted(deferred))}")
+            failed = True
+        if failed:
+            sys.exit(1)
+        print(f"\nwithin budget: {median:.0f} ms <= {args.budget_ms:.0f} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare the local triage classifier with recorded API answers.
+
+    python -m benchmarks.triage                      # issues the API labelled (triage_source = api)
+    python -m benchmarks.triage --responses api.jsonl
+
+Each JSONL line holds title, description, sentiment, priority and optionally
+latency_ms (how long the API took). The first --train-fraction of the
+samples trains the naive Bayes model; the rest are used for scoring, both
+for the trained model and for the keyword fallback.
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from classifier import LocalClassifier
+
+
+def load_samples(path):
+    if path:
+        with open(path) as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        return [(r["title"], r["description"], r["sentiment"], r["priority"], r.get("latency_ms")) for r in rows]
+
+    from app import create_app
+    app = create_app()
+    from model import db, Issue
+    with app.app_context():
+        rows = db.session.query(Issue.title, Issue.description, Issue.sentiment, Issue.priority) \
+            .filter(Issue.triage_source == "api", Issue.sentiment.isnot(None), Issue.priority.isnot(None)).all()
+    return [(*r, None) for r in rows]
+
+
+def score(clf, samples, repeat):
+    timings = []
+    agree = {"sentiment": 0, "priority": 0}
+    for title, description, sentiment, priority, _ in samples:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = clf.classify(title, description)
+        timings.append((time.perf_counter() - start) / repeat * 1e6)
+        agree["sentiment"] += result["sentiment"] == sentiment
+        agree["priority"] += result["priority"] == priority
+    timings.sort()
+    return {
+        "mean_us": statistics.fmean(timings),
+        "p50_us": timings[len(timings) // 2],
+        "p99_us": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+        "sentiment_agreement": agree["sentiment"] / len(samples),
+        "priority_agreement": agree["priority"] / len(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--responses", help="JSONL of recorded API responses (default: triaged issues in the DB)")
+    parser.add_argument("--train-fraction", type=float, default=0.8)
+    parser.add_argument("--repeat", type=int, default=20, help="classifications per sample when timing")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    samples = load_samples(args.responses)
+    if len(samples) < 2:
+        raise SystemExit("Need at least two recorded responses")
+    random.Random(args.seed).shuffle(samples)
+    cut = max(1, min(len(samples) - 1, int(len(samples) * args.train_fraction)))
+    train, test = samples[:cut], samples[cut:]
+
+    trained = LocalClassifier().fit((t, d, s, p) for t, d, s, p, _ in train)
+    print(f"{len(train)} training samples, {len(test)} scored")
+    for name, clf in (("naive bayes", trained), ("keywords", LocalClassifier())):
+        r = score(clf, test, args.repeat)
+        print(f"{name:12} mean {r['mean_us']:8.1f} us  p50 {r['p50_us']:8.1f} us  p99 {r['p99_us']:8.1f} us  "
+              f"sentiment {r['sentiment_agreement']:6.1%}  priority {r['priority_agreement']:6.1%}")
+
+    api = sorted(s[4] for s in test if s[4] is not None)
+    if api:
+        print(f"{'api':12} mean {statistics.fmean(api):8.1f} ms  p50 {api[len(api) // 2]:8.1f} ms  (recorded)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import csv
+import io
+import json
+from flask import Blueprint, request, jsonify
+from sqlalchemy.exc import IntegrityError
+from model import db, User, WorkerInfo
+from issues import role_required
+from passwords import hasher
+
+import_bp = Blueprint("user_import", __name__, url_prefix="/auth")
+
+IMPORT_CHUNK_SIZE = 500
+IMPORT_ROLES = ("student", "worker")
+JSONL_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-lines", "application/json")
+
+
+def _read_rows(stream, fmt):
+    """Yield (line, row, error) from a CSV or JSONL byte stream without loading it whole."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+    for line_no, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_no, None, "Invalid JSON"
+            continue
+        if not isinstance(row, dict):
+            yield line_no, None, "Expected a JSON object"
+            continue
+        yield line_no, row, None
+
+
+def _validate(row, default_role):
+    def field(*names):
+        for name in names:
+            value = row.get(name)
+            if value is not None and str(value).strip():
+                return str(value).strip()
+        return None
+
+    fields = {
+        "full_name": field("full_name", "name"),
+        "email": field("email"),
+        "password": field("password"),
+        "role": (field("role") or default_role).lower(),
+        "room_no": field("room_no", "roomNo") or "",
+        "worker_type": field("worker_type") or "General",
+    }
+    if not fields["full_name"] or not fields["email"] or not fields["password"]:
+        return None, "Missing fields"
+    if fields["role"] not in IMPORT_ROLES:
+        return None, "Invalid role"
+    return fields, None
+
+
+def _add(fields, password_hash):
+    user = User(
+        full_name=fields["full_name"],
+        email=fields["email"],
+        password_hash=password_hash,
+        role=fields["role"],
+        room_no=fields["room_no"] if fields["role"] == "student" else None,
+    )
+    db.session.add(user)
+    return user
+
+
+def _import_chunk(chunk, errors):
+    """Insert one chunk in a single transaction; returns how many accounts were created."""
+    emails = [fields["email"] for _, fields in chunk]
+    taken = {email for (email,) in db.session.query(User.email).filter(User.email.in_(emails))}
+    fresh = []
+    for line, fields in chunk:
+        if fields["email"] in taken:
+            errors.append({"line": line, "email": fields["email"], "error": "Email already exists"})
+        else:
+            taken.add(fields["email"])
+            fresh.append((line, fields))
+    if not fresh:
+        return 0
+
+    hashes = hasher.hash_many([fields["password"] for _, fields in fresh])
+    try:
+        users = [_add(fields, h) for (_, fields), h in zip(fresh, hashes)]
+        db.session.flush()
+        for user, (_, fields) in zip(users, fresh):
+            if fields["role"] == "worker":
+                db.session.add(WorkerInfo(user_id=user.id, worker_type=fields["worker_type"]))
+        db.session.commit()
+        created = len(users)
+    except IntegrityError:
+        # Someone signed up with one of these emails meanwhile; go row by row.
+        db.session.rollback()
+        created = 0
+        for (line, fields), h in zip(fresh, hashes):
+            try:
+                with db.session.begin_nested():
+                    user = _add(fields, h)
+                    db.session.flush()
+                    if fields["role"] == "worker":
+                        db.session.add(WorkerInfo(user_id=user.id, worker_type=fields["worker_type"]))
+                created += 1
+            except IntegrityError:
+                errors.append({"line": line, "email": fields["email"], "error": "Email already exists"})
+        db.session.commit()
+    db.session.expunge_all()
+    return created
+
+
+@import_bp.post("/import")
+@role_required("admin")
+def import_users():
+    """
+    Create student and worker accounts from a CSV or JSONL upload, either as
+    the raw request body or as a multipart "file" field. Columns/keys:
+    full_name, email, password, role, room_no, worker_type. ?role= sets the
+    role for rows without one (default student); ?format=csv|jsonl overrides
+    detection from the content type or file name.
+
+    Rows are committed IMPORT_CHUNK_SIZE at a time, so a failure part-way
+    keeps the chunks before it. The response lists every rejected row.
+    """
+    default_role = request.args.get("role", "student").lower()
+    upload = request.files.get("file")
+    if upload is not None:
+        stream, name, mimetype = upload.stream, upload.filename or "", upload.mimetype
+    else:
+        stream, name, mimetype = request.stream, "", request.mimetype
+
+    fmt = request.args.get("format")
+    if not fmt:
+        if mimetype == "text/csv" or name.endswith(".csv"):
+            fmt = "csv"
+        elif mimetype in JSONL_TYPES or name.endswith((".jsonl", ".ndjson")):
+            fmt = "jsonl"
+    if fmt not in ("csv", "jsonl"):
+        return jsonify({"error": "Send text/csv or application/x-ndjson, or pass ?format=csv|jsonl"}), 400
+
+    created, rows, errors, chunk = 0, 0, [], []
+    try:
+        for line, row, error in _read_rows(stream, fmt):
+            rows += 1
+            if error is None:
+                fields, error = _validate(row, default_role)
+            if error:
+                errors.append({"line": line, "email": (row or {}).get("email"), "error": error})
+                continue
+            chunk.append((line, fields))
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                created += _import_chunk(chunk, errors)
+                chunk = []
+        if chunk:
+            created += _import_chunk(chunk, errors)
+    except (UnicodeDecodeError, csv.Error) as e:
+        db.session.rollback()
+        return jsonify({"error": f"Unreadable upload: {e}", "created": created, "errors": errors}), 400
+
+    errors.sort(key=lambda e: e["line"])
+    return jsonify({"rows": rows, "created": created, "failed": len(errors), "errors": errors}), 200
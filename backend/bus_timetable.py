@@ -1,15 +1,19 @@
 from flask import request, jsonify
 from model import db
 from flask import Blueprint
+from cache import response_cache
+from versions import conditional
 
 bus_bp = Blueprint("bus_timetable", __name__)
 
 class BusTimetable(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    route_name = db.Column(db.String(100), nullable=False)
+    route_name = db.Column(db.String(100), nullable=False, index=True)
     schedule = db.Column(db.Text, nullable=False)
 
 @bus_bp.route('/api/timetable', methods=['GET'])
+@conditional("bus_timetable")
+@response_cache.cached("timetable")
 def get_timetable():
     timetables = BusTimetable.query.all()
     data = [{"id": t.id, "route_name": t.route_name, "schedule": t.schedule} for t in timetables]
@@ -29,4 +33,5 @@ def update_timetable():
         db.session.add(new_entry)
 
     db.session.commit()
+    response_cache.invalidate("timetable")
     return jsonify({"message": "Timetable updated successfully!"})
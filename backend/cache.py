@@ -0,0 +1,168 @@
+import os
+import time
+import pickle
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict, defaultdict
+from functools import wraps
+from flask import g, request, Response
+from flask_jwt_extended import get_jwt
+
+
+class MemoryBackend:
+    """Per-process LRU cache with a TTL on every entry."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace, key):
+        with self._lock:
+            entry = self._data.get((namespace, key))
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[(namespace, key)]
+                return None
+            self._data.move_to_end((namespace, key))
+            return value
+
+    def set(self, namespace, key, value, ttl):
+        with self._lock:
+            self._data[(namespace, key)] = (time.monotonic() + ttl, value)
+            self._data.move_to_end((namespace, key))
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, namespace, key):
+        with self._lock:
+            self._data.pop((namespace, key), None)
+
+    def invalidate(self, namespace):
+        with self._lock:
+            for k in [k for k in self._data if k[0] == namespace]:
+                del self._data[k]
+
+
+class FileBackend:
+    """
+    Cache stored as one file per entry under ``path/<namespace>/``, so every
+    worker process on the host shares entries and invalidations. Pointing
+    ``path`` at /dev/shm keeps it in shared memory.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, namespace, key):
+        return os.path.join(self.path, namespace, hashlib.sha1(key.encode()).hexdigest())
+
+    def get(self, namespace, key):
+        fname = self._file(namespace, key)
+        try:
+            with open(fname, "rb") as f:
+                expires_at, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if expires_at < time.time():
+            try:
+                os.remove(fname)
+            except OSError:
+                pass
+            return None
+        return value
+
+    def set(self, namespace, key, value, ttl):
+        directory = os.path.join(self.path, namespace)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((time.time() + ttl, value), f)
+        os.replace(tmp, self._file(namespace, key))
+
+    def invalidate(self, namespace):
+        directory = os.path.join(self.path, namespace)
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return
+        for name in names:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+class NullBackend:
+    def get(self, namespace, key):
+        return None
+
+    def set(self, namespace, key, value, ttl):
+        pass
+
+    def invalidate(self, namespace):
+        pass
+
+
+class ResponseCache:
+    """Caches rendered GET responses per endpoint namespace and caller role."""
+
+    def __init__(self):
+        self.backend = MemoryBackend()
+        self.default_ttl = 300
+        self.stats = defaultdict(lambda: {"hits": 0, "misses": 0, "invalidations": 0})
+
+    def init_app(self, app):
+        kind = app.config.get("CACHE_BACKEND", "memory")
+        if kind == "memory":
+            self.backend = MemoryBackend(app.config.get("CACHE_MAX_ENTRIES", 1024))
+        elif kind == "file":
+            self.backend = FileBackend(app.config.get("CACHE_DIR") or os.path.join(tempfile.gettempdir(), "hostel-cache"))
+        elif kind == "null":
+            self.backend = NullBackend()
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND {kind!r}")
+        self.default_ttl = app.config.get("CACHE_TTL", 300)
+
+    def cached(self, namespace, ttl=None):
+        """
+        Cache successful responses of a GET view under ``namespace``. Below
+        @conditional the key includes the table versions it read, so an
+        entry stops matching as soon as any process commits a write.
+        """
+        def wrapper(fn):
+            @wraps(fn)
+            def inner(*args, **kwargs):
+                key = f"{_role()}:{request.full_path}:{g.get('table_versions', '')}"
+                hit = self.backend.get(namespace, key)
+                if hit is not None:
+                    self.stats[namespace]["hits"] += 1
+                    body, mimetype = hit
+                    return Response(body, mimetype=mimetype)
+                self.stats[namespace]["misses"] += 1
+
+                resp = fn(*args, **kwargs)
+                if isinstance(resp, Response) and resp.status_code == 200:
+                    self.backend.set(namespace, key, (resp.get_data(), resp.mimetype), ttl or self.default_ttl)
+                return resp
+            return inner
+        return wrapper
+
+    def invalidate(self, *namespaces):
+        for namespace in namespaces:
+            self.backend.invalidate(namespace)
+            self.stats[namespace]["invalidations"] += 1
+
+
+def _role():
+    try:
+        return get_jwt().get("role") or "anonymous"
+    except RuntimeError:
+        return "anonymous"
+
+
+response_cache = ResponseCache()
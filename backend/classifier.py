@@ -0,0 +1,109 @@
+import json
+import math
+import re
+from collections import Counter, defaultdict
+
+TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+# Used until a model has been trained from stored issues.
+KEYWORDS = {
+    "priority": {
+        "High": ["fire", "smoke", "spark", "sparking", "shock", "short", "circuit", "flood", "flooding",
+                 "leak", "leaking", "burst", "gas", "urgent", "emergency", "danger", "dangerous",
+                 "injury", "injured", "lock", "locked", "theft", "stolen", "no water", "no power"],
+        "Medium": ["broken", "not working", "stopped", "wifi", "internet", "slow", "fan", "light",
+                   "ac", "heater", "geyser", "toilet", "flush", "tap", "door", "window"],
+        "Low": ["clean", "cleaning", "dust", "paint", "request", "minor", "replace", "chair",
+                "table", "curtain", "shelf", "suggestion"],
+    },
+    "sentiment": {
+        "Angry": ["again", "still", "worst", "terrible", "pathetic", "ridiculous", "fed up",
+                  "unacceptable", "useless", "disgusting", "angry", "frustrated", "!!"],
+        "Sad": ["sad", "disappointed", "unfortunately", "please help", "sick", "ill", "upset",
+                "unable", "can't sleep", "cannot study"],
+        "Happy": ["thanks", "thank you", "please", "kindly", "appreciate"],
+    },
+}
+DEFAULTS = {"sentiment": "Happy", "priority": "Low"}
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class LocalClassifier:
+    """
+    Multinomial naive Bayes over word counts, one model per label
+    (sentiment, priority). Untrained, it falls back to keyword matching.
+    """
+
+    def __init__(self):
+        self.models = {}
+
+    def fit(self, samples):
+        """samples: iterable of (title, description, sentiment, priority)."""
+        counts = {label: defaultdict(Counter) for label in DEFAULTS}
+        docs = {label: Counter() for label in DEFAULTS}
+        for title, description, sentiment, priority in samples:
+            tokens = tokenize(f"{title} {description}")
+            for label, value in (("sentiment", sentiment), ("priority", priority)):
+                if value:
+                    counts[label][value].update(tokens)
+                    docs[label][value] += 1
+
+        self.models = {}
+        for label in DEFAULTS:
+            total_docs = sum(docs[label].values())
+            if not total_docs:
+                continue
+            vocab = set().union(*counts[label].values())
+            classes = {}
+            for value, n in docs[label].items():
+                token_counts = counts[label][value]
+                denom = sum(token_counts.values()) + len(vocab) + 1
+                classes[value] = {
+                    "prior": math.log(n / total_docs),
+                    "unknown": math.log(1 / denom),
+                    "tokens": {t: math.log((c + 1) / denom) for t, c in token_counts.items()},
+                }
+            self.models[label] = classes
+        return self
+
+    def classify(self, title, description):
+        text = f"{title} {description}"
+        tokens = tokenize(text)
+        return {label: self._predict(label, text, tokens) for label in DEFAULTS}
+
+    def _predict(self, label, text, tokens):
+        model = self.models.get(label)
+        if not model:
+            return self._keywords(label, text, tokens)
+        best, best_score = DEFAULTS[label], -math.inf
+        for value, params in model.items():
+            logs = params["tokens"]
+            unknown = params["unknown"]
+            score = params["prior"] + sum(logs.get(t, unknown) for t in tokens)
+            if score > best_score:
+                best, best_score = value, score
+        return best
+
+    def _keywords(self, label, text, tokens):
+        lowered = text.lower()
+        words = set(tokens)
+        scores = {
+            value: sum(1 for kw in keywords if (kw in words if kw.isalnum() else kw in lowered))
+            for value, keywords in KEYWORDS[label].items()
+        }
+        value, score = max(scores.items(), key=lambda kv: kv[1])
+        return value if score else DEFAULTS[label]
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.models, f)
+
+    @classmethod
+    def load(cls, path):
+        clf = cls()
+        with open(path) as f:
+            clf.models = json.load(f)
+        return clf
@@ -0,0 +1,127 @@
+import gzip
+import zlib
+import hashlib
+from flask import request
+from cache import MemoryBackend
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "application/x-ndjson", "text/csv", "text/plain", "text/html"}
+# Suffixes compressed representations add to the ETag, so caches never
+# confuse them with the plain body; conditional() accepts them back.
+ENCODINGS = ("br", "gzip")
+
+
+class Compressor:
+    """
+    gzip or brotli (when the brotli package is installed) for responses of
+    at least COMPRESS_MIN_SIZE bytes, whichever the client's Accept-Encoding
+    prefers. Compressed GET bodies are kept in a per-process LRU keyed by
+    the response's ETag or a digest of the plain body, so a payload served
+    again (a response-cache hit, a list every student polls) is compressed
+    once. Streamed responses (exports, stream_array) are compressed chunk
+    by chunk as they are sent, whatever their size.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 5
+        self.brotli = None
+        self.bodies = MemoryBackend(256)
+        self.stats = {"compressed": 0, "cache_hits": 0, "bytes_in": 0, "bytes_out": 0}
+
+    def init_app(self, app):
+        self.enabled = app.config.get("COMPRESS_ENABLED", True)
+        self.min_size = app.config.get("COMPRESS_MIN_SIZE", 1024)
+        self.gzip_level = app.config.get("COMPRESS_LEVEL", 6)
+        self.brotli_quality = app.config.get("COMPRESS_BROTLI_QUALITY", 5)
+        self.bodies = MemoryBackend(app.config.get("COMPRESS_CACHE_ENTRIES", 256))
+        try:
+            import brotli
+            self.brotli = brotli
+        except ImportError:
+            self.brotli = None
+        if self.enabled:
+            app.after_request(self._compress)
+
+    def _encoding(self):
+        accept = request.accept_encodings
+        options = ["br", "gzip"] if self.brotli is not None else ["gzip"]
+        best = accept.best_match(options)
+        return best if best and accept[best] > 0 else None
+
+    def _encode(self, encoding, body):
+        if encoding == "br":
+            return self.brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def _encode_stream(self, encoding, chunks):
+        if encoding == "br":
+            encoder = self.brotli.Compressor(quality=self.brotli_quality)
+            compress, finish = encoder.process, encoder.finish
+        else:
+            encoder = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            compress, finish = encoder.compress, encoder.flush
+        for chunk in chunks:
+            self.stats["bytes_in"] += len(chunk)
+            out = compress(chunk)
+            if out:
+                self.stats["bytes_out"] += len(out)
+                yield out
+        out = finish()
+        self.stats["bytes_out"] += len(out)
+        yield out
+
+    def _compress(self, response):
+        if (response.mimetype not in COMPRESSIBLE_MIMETYPES or response.direct_passthrough
+                or "Content-Encoding" in response.headers):
+            return response
+        response.vary.add("Accept-Encoding")
+        if response.status_code < 200 or response.status_code in (204, 304) or request.method == "HEAD":
+            return response
+        if response.is_streamed:
+            encoding = self._encoding()
+            if encoding is not None:
+                self.stats["compressed"] += 1
+                response.response = self._encode_stream(encoding, response.iter_encoded())
+                self._mark(response, encoding)
+            return response
+        body = response.get_data()
+        if len(body) < self.min_size:
+            return response
+        encoding = self._encoding()
+        if encoding is None:
+            return response
+
+        cacheable = request.method == "GET" and not response.cache_control.no_store
+        key = None
+        if cacheable:
+            # A conditional() ETag already identifies the body; others are hashed.
+            etag = response.get_etag()[0] or hashlib.blake2b(body, digest_size=16).hexdigest()
+            key = f"{encoding}:{etag}"
+        compressed = self.bodies.get("compressed", key) if cacheable else None
+        if compressed is None:
+            compressed = self._encode(encoding, body)
+            if len(compressed) >= len(body):
+                return response
+            if cacheable:
+                self.bodies.set("compressed", key, compressed, 3600)
+        else:
+            self.stats["cache_hits"] += 1
+        self.stats["compressed"] += 1
+        self.stats["bytes_in"] += len(body)
+        self.stats["bytes_out"] += len(compressed)
+
+        response.set_data(compressed)
+        self._mark(response, encoding)
+        return response
+
+    @staticmethod
+    def _mark(response, encoding):
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f"{etag}-{encoding}", weak)
+
+
+compressor = Compressor()
@@ -0,0 +1,156 @@
+import datetime
+import functools
+import re
+import time
+import threading
+import zlib
+from collections import defaultdict
+from classifier import tokenize
+from model import db, Issue
+
+OPEN_STATUSES = ("Pending", "In Progress")
+
+STOPWORDS = frozenset("""
+    a an and are as at be been but by can could do does for from has have i in is it its my no not
+    of on or our please room since so still the their there this to too us was we were with
+""".split())
+
+# 32 hash permutations split into 16 bands of 2: issues sharing roughly 40%
+# of their words land in a common bucket with ~94% probability.
+NUM_PERM = 32
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+_PRIME = (1 << 61) - 1
+_PERMS = [((i * 0x9E3779B97F4A7C15 + 1) % _PRIME | 1, (i * 0xC2B2AE3D27D4EB4F + 7) % _PRIME) for i in range(NUM_PERM)]
+
+
+def floor_of(room):
+    """Floor of a room number like "A-214" -> "2"; rooms without three digits stand alone."""
+    digits = re.sub(r"\D", "", room or "")
+    if len(digits) >= 3:
+        return digits[:-2]
+    return (room or "").strip().lower()
+
+
+def shingles(title, description):
+    return frozenset(t for t in tokenize(f"{title} {description}") if len(t) > 2 and t not in STOPWORDS)
+
+
+@functools.lru_cache(maxsize=65536)
+def _token_hashes(token):
+    h = zlib.crc32(token.encode())
+    return tuple((a * h + b) % _PRIME for a, b in _PERMS)
+
+
+def signature(tokens):
+    return tuple(map(min, zip(*map(_token_hashes, tokens))))
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class DuplicateIndex:
+    """
+    MinHash/LSH index of recent open issues, partitioned by floor. Each
+    process keeps its own copy and catches up with other writers by reading
+    issues whose change_seq moved since its last look, so a check costs one
+    small indexed query plus a handful of bucket lookups regardless of how
+    many issues are open.
+    """
+
+    def __init__(self):
+        self.threshold = 0.4
+        self.window = datetime.timedelta(days=30)
+        self.max_candidates = 50
+        self._entries = {}
+        self._buckets = defaultdict(set)
+        self._seq = None
+        self._swept = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.threshold = app.config.get("DUPLICATE_THRESHOLD", 0.4)
+        self.window = datetime.timedelta(days=app.config.get("DUPLICATE_WINDOW_DAYS", 30))
+
+    def _keys(self, floor, sig):
+        return [(floor, band, sig[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+    def _remove(self, issue_id):
+        entry = self._entries.pop(issue_id, None)
+        if entry:
+            for key in self._keys(entry["floor"], entry["sig"]):
+                self._buckets[key].discard(issue_id)
+                if not self._buckets[key]:
+                    del self._buckets[key]
+
+    def _add(self, row):
+        tokens = shingles(row.title, row.description)
+        if not tokens:
+            return
+        entry = {
+            "id": row.id,
+            "title": row.title,
+            "room": row.room_number,
+            "floor": floor_of(row.room_number),
+            "created_at": row.created_at,
+            "tokens": tokens,
+            "sig": signature(tokens),
+        }
+        self._entries[row.id] = entry
+        for key in self._keys(entry["floor"], entry["sig"]):
+            self._buckets[key].add(row.id)
+
+    def refresh(self):
+        """Apply issue changes committed since the last refresh (by any process)."""
+        columns = (Issue.id, Issue.title, Issue.description, Issue.room_number, Issue.status,
+                   Issue.created_at, Issue.change_seq)
+        cutoff = datetime.datetime.utcnow() - self.window
+        with self._lock:
+            if self._seq is None:
+                self._seq = db.session.query(db.func.max(Issue.change_seq)).scalar() or 0
+                rows = db.session.query(*columns).filter(
+                    Issue.status.in_(OPEN_STATUSES), Issue.created_at >= cutoff
+                ).all()
+            else:
+                rows = db.session.query(*columns).filter(Issue.change_seq > self._seq) \
+                    .order_by(Issue.change_seq).all()
+            for row in rows:
+                self._remove(row.id)
+                if row.status in OPEN_STATUSES and row.created_at >= cutoff:
+                    self._add(row)
+                self._seq = max(self._seq, row.change_seq or 0)
+            if time.monotonic() - self._swept > 600:
+                for issue_id in [i for i, e in self._entries.items() if e["created_at"] < cutoff]:
+                    self._remove(issue_id)
+                self._swept = time.monotonic()
+
+    def find(self, title, description, room_number, limit=3):
+        """Open issues on the same floor that look like the same complaint, best match first."""
+        tokens = shingles(title, description)
+        if not tokens:
+            return []
+        self.refresh()
+        floor = floor_of(room_number)
+        with self._lock:
+            candidates = set()
+            for key in self._keys(floor, signature(tokens)):
+                candidates |= self._buckets.get(key, set())
+                if len(candidates) >= self.max_candidates:
+                    break
+            scored = []
+            for issue_id in candidates:
+                entry = self._entries[issue_id]
+                score = jaccard(tokens, entry["tokens"])
+                if entry["room"] == room_number:
+                    score = min(1.0, score + 0.1)
+                if score >= self.threshold:
+                    scored.append((score, entry))
+        scored.sort(key=lambda s: (-s[0], -s[1]["id"]))
+        return [
+            {"id": e["id"], "title": e["title"], "roomNumber": e["room"], "similarity": round(score, 2)}
+            for score, e in scored[:limit]
+        ]
+
+
+duplicate_index = DuplicateIndex()
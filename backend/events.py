@@ -0,0 +1,200 @@
+import json
+import time
+import itertools
+import datetime
+import threading
+from collections import deque, namedtuple
+from flask import Blueprint, Response, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from sqlalchemy import func
+from model import db, EventLog
+
+events_bp = Blueprint("events", __name__, url_prefix="/api")
+
+Event = namedtuple("Event", "id kind worker_id payload")
+
+
+def publish(kind, payload, worker_id=None):
+    """
+    Record a change event in the current transaction; it is only streamed
+    once the caller commits. Call it after next_seq(): the event id is taken
+    at the next flush, and only under the sync counter lock do ids commit
+    in order, which the relay's id > head cursor relies on. Every EVENTS_PRUNE_EVERY publishes, expired
+    events are deleted in the same transaction, whether or not anyone is
+    streaming.
+    """
+    db.session.add(EventLog(kind=kind, worker_id=worker_id, payload=json.dumps(payload)))
+    if broker.prune_every and next(broker.published) % broker.prune_every == 0:
+        broker.prune()
+
+
+def visible(event, role, user_id):
+    # Workers only hear about their own assignments (and notices).
+    if role == "worker":
+        return event.kind.startswith("notice.") or event.worker_id == user_id
+    return True
+
+
+class EventBroker:
+    """
+    Fans committed EventLog rows out to SSE clients. One relay thread per
+    process polls the table (only while someone is connected) into a ring
+    buffer; clients just wait on a condition, so an idle client costs a
+    parked thread and no queries. Because events come from the table, writes
+    made by other worker processes are delivered too.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.poll_interval = 0.5
+        self.heartbeat = 15
+        self.max_clients = 100
+        self.retention = datetime.timedelta(hours=24)
+        self.prune_every = 500
+        self.published = itertools.count(1)
+        self.clients = 0
+        self._buffer = deque(maxlen=1000)
+        self._head = 0
+        self._evicted = 0
+        self._cond = threading.Condition()
+        self._relay = None
+
+    def init_app(self, app):
+        self.app = app
+        self.poll_interval = app.config.get("EVENTS_POLL_INTERVAL", 0.5)
+        self.heartbeat = app.config.get("EVENTS_HEARTBEAT", 15)
+        self.max_clients = app.config.get("EVENTS_MAX_CLIENTS", 100)
+        self.retention = datetime.timedelta(hours=app.config.get("EVENTS_RETENTION_HOURS", 24))
+        self.prune_every = app.config.get("EVENTS_PRUNE_EVERY", 500)
+        self._buffer = deque(maxlen=app.config.get("EVENTS_BUFFER_SIZE", 1000))
+
+    def prune(self):
+        """Delete events older than the retention window; the caller commits."""
+        cutoff = datetime.datetime.utcnow() - self.retention
+        return EventLog.query.filter(EventLog.created_at < cutoff).delete(synchronize_session=False)
+
+    def head(self):
+        """Id of the newest committed event."""
+        with self._cond:
+            if self._relay is not None:
+                return self._head
+        return db.session.query(func.max(EventLog.id)).scalar() or 0
+
+    def connect(self):
+        with self._cond:
+            if self.clients >= self.max_clients:
+                return False
+            self.clients += 1
+            if self._relay is None:
+                self._head = db.session.query(func.max(EventLog.id)).scalar() or 0
+                self._relay = threading.Thread(target=self._relay_loop, name="event-relay", daemon=True)
+                self._relay.start()
+            return True
+
+    def disconnect(self):
+        with self._cond:
+            self.clients -= 1
+
+    def wait(self, after_id, timeout):
+        """
+        Block until events newer than ``after_id`` arrive or ``timeout`` passes.
+        Returns (events, complete); complete is False when the buffer has
+        already dropped some of them.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._head > after_id, timeout)
+            events = [e for e in self._buffer if e.id > after_id]
+            return events, after_id >= self._evicted
+
+    def _relay_loop(self):
+        while True:
+            time.sleep(self.poll_interval)
+            if not self.clients:
+                continue
+            try:
+                with self.app.app_context():
+                    rows = EventLog.query.filter(EventLog.id > self._head).order_by(EventLog.id).limit(500).all()
+            except Exception:
+                self.app.logger.exception("event relay poll failed")
+                continue
+            if rows:
+                new = [Event(r.id, r.kind, r.worker_id, r.payload) for r in rows]
+                with self._cond:
+                    overflow = len(self._buffer) + len(new) - self._buffer.maxlen
+                    if overflow > 0:
+                        self._evicted = (list(self._buffer) + new)[overflow - 1].id
+                    self._buffer.extend(new)
+                    self._head = new[-1].id
+                    self._cond.notify_all()
+
+
+broker = EventBroker()
+
+
+def _format(event):
+    return f"id: {event.id}\nevent: {event.kind}\ndata: {event.payload}\n\n"
+
+
+@events_bp.get("/events")
+@jwt_required(locations=["headers", "query_string"])
+def stream_events():
+    """
+    Server-Sent Events feed of issue and notice changes. EventSource cannot
+    send headers, so the token may also be passed as ?jwt=. Reconnecting
+    clients resume from Last-Event-ID (or ?last_event_id=).
+    """
+    role = get_jwt().get("role")
+    user_id = int(get_jwt_identity())
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    # An id we never sent is treated as no id: the client starts from now.
+    last_id = int(last_id) if last_id and last_id.isdigit() else None
+
+    if not broker.connect():
+        return jsonify({"error": "Too many event streams"}), 503
+
+    try:
+        backlog, reset = [], False
+        if last_id is not None:
+            rows = EventLog.query.filter(EventLog.id > last_id).order_by(EventLog.id).limit(1001).all()
+            oldest = db.session.query(func.min(EventLog.id)).scalar()
+            reset = len(rows) > 1000 or (oldest is not None and oldest > last_id + 1)
+            backlog = [Event(r.id, r.kind, r.worker_id, r.payload) for r in rows[:1000]]
+        if reset or last_id is None:
+            backlog, last_id = [], broker.head()
+        else:
+            last_id = backlog[-1].id if backlog else last_id
+    except Exception:
+        broker.disconnect()
+        raise
+    finally:
+        # The stream below never touches the database; don't pin a connection for its lifetime.
+        db.session.remove()
+
+    def generate(last_id):
+        try:
+            yield "retry: 3000\n\n"
+            if reset:
+                yield f"id: {last_id}\nevent: reset\ndata: {{}}\n\n"
+            for event in backlog:
+                if visible(event, role, user_id):
+                    yield _format(event)
+            while True:
+                events, complete = broker.wait(last_id, broker.heartbeat)
+                if not complete:
+                    last_id = broker.head()
+                    yield f"id: {last_id}\nevent: reset\ndata: {{}}\n\n"
+                    continue
+                if not events:
+                    yield ": keepalive\n\n"
+                    continue
+                for event in events:
+                    last_id = event.id
+                    if visible(event, role, user_id):
+                        yield _format(event)
+        finally:
+            broker.disconnect()
+
+    return Response(generate(last_id), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
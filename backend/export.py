@@ -0,0 +1,141 @@
+import csv
+import datetime
+import io
+import json
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+from model import db, Issue, User, WorkerInfo, StudentMedical
+from issues import role_required
+
+export_bp = Blueprint("export", __name__, url_prefix="/api/export")
+
+EXPORT_BATCH_SIZE = 1000
+CSV_FLUSH_BYTES = 64 * 1024
+
+
+def _parse_range(args):
+    """?from= / ?to= as ISO dates or datetimes; a bare ``to`` date includes that whole day."""
+    start = end = None
+    if args.get("from"):
+        start = datetime.datetime.fromisoformat(args["from"])
+    if args.get("to"):
+        end = datetime.datetime.fromisoformat(args["to"])
+        if len(args["to"]) == 10:
+            end += datetime.timedelta(days=1)
+    return start, end
+
+
+def _value(v):
+    if isinstance(v, (datetime.datetime, datetime.date)):
+        return v.isoformat()
+    return v
+
+
+def _rows(stmt):
+    # yield_per streams from a server-side cursor where the driver has one
+    # (psycopg2) and fetches in batches elsewhere; rows are never all in memory.
+    result = db.session.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for partition in result.partitions():
+        for row in partition:
+            yield row
+
+
+def _ndjson(stmt):
+    for row in _rows(stmt):
+        yield json.dumps({k: _value(v) for k, v in row._mapping.items()}) + "\n"
+
+
+def _csv(stmt):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow([c.name for c in stmt.selected_columns])
+    for row in _rows(stmt):
+        writer.writerow([_value(v) for v in row])
+        if buf.tell() >= CSV_FLUSH_BYTES:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+def _export(stmt, name):
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in ("ndjson", "csv"):
+        return jsonify({"error": "format must be ndjson or csv"}), 400
+    body, mimetype = (_csv(stmt), "text/csv") if fmt == "csv" else (_ndjson(stmt), "application/x-ndjson")
+    filename = f"{name}-{datetime.date.today().isoformat()}.{fmt}"
+    return Response(stream_with_context(body), mimetype=mimetype, headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "X-Accel-Buffering": "no",
+    })
+
+
+@export_bp.get("/issues")
+@role_required("admin")
+def export_issues():
+    """All issues, including cancelled ones. Filters: from, to (created_at), status, room, assignee; format=ndjson|csv."""
+    args = request.args
+    try:
+        start, end = _parse_range(args)
+        assignee = int(args["assignee"]) if args.get("assignee") else None
+    except ValueError:
+        return jsonify({"error": "Invalid from, to or assignee"}), 400
+
+    assignee_user = aliased(User)
+    stmt = (
+        select(
+            Issue.id, Issue.title, Issue.description, Issue.room_number, Issue.status,
+            Issue.created_by, Issue.reporter_id, Issue.created_at, Issue.upvotes,
+            Issue.assigned_to, assignee_user.full_name.label("assignee_name"), Issue.assigned_at,
+            Issue.sentiment, Issue.priority,
+        )
+        .outerjoin(assignee_user, assignee_user.id == Issue.assigned_to)
+        .order_by(Issue.created_at, Issue.id)
+    )
+    if start:
+        stmt = stmt.where(Issue.created_at >= start)
+    if end:
+        stmt = stmt.where(Issue.created_at < end)
+    if args.get("status"):
+        stmt = stmt.where(Issue.status.in_(args.getlist("status")))
+    if args.get("room"):
+        stmt = stmt.where(Issue.room_number == args["room"])
+    if assignee is not None:
+        stmt = stmt.where(Issue.assigned_to == assignee)
+    return _export(stmt, "issues")
+
+
+@export_bp.get("/users")
+@role_required("admin")
+def export_users():
+    """Accounts without password hashes. Filters: from, to (created_at), role; format=ndjson|csv."""
+    args = request.args
+    try:
+        start, end = _parse_range(args)
+    except ValueError:
+        return jsonify({"error": "Invalid from or to"}), 400
+
+    stmt = (
+        select(User.id, User.full_name, User.email, User.role, User.room_no, User.created_at, WorkerInfo.worker_type)
+        .outerjoin(WorkerInfo, WorkerInfo.user_id == User.id)
+        .order_by(User.id)
+    )
+    if start:
+        stmt = stmt.where(User.created_at >= start)
+    if end:
+        stmt = stmt.where(User.created_at < end)
+    if args.get("role"):
+        stmt = stmt.where(User.role.in_(args.getlist("role")))
+    return _export(stmt, "users")
+
+
+@export_bp.get("/medical")
+@role_required("admin")
+def export_medical():
+    """Student medical records. Records carry no dates or status, so the only filter is email; format=ndjson|csv."""
+    stmt = select(StudentMedical.id, StudentMedical.student_name, StudentMedical.email, StudentMedical.prescribed_medicine) \
+        .order_by(StudentMedical.id)
+    if request.args.get("email"):
+        stmt = stmt.where(StudentMedical.email == request.args["email"])
+    return _export(stmt, "medical")
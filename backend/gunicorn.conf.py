@@ -0,0 +1,70 @@
+"""
+gunicorn settings for the backend (gunicorn -c gunicorn.conf.py wsgi:app).
+
+Worker count: each gthread worker is a process serving GUNICORN_THREADS
+requests at a time. Most requests here wait on the database or on open
+/api/events streams rather than the CPU, so the default is the usual
+2 x cores + 1 processes with 4 threads each. With SQLite every write
+still goes through one lock, so more processes mostly buy read
+concurrency; if write-heavy endpoints start timing out on "database is
+locked", lower WEB_CONCURRENCY before raising it.
+
+Event streams: under gthread each open /api/events stream holds a thread
+for as long as the client stays connected, so EVENTS_MAX_CLIENTS (a
+per-process limit) is capped at GUNICORN_THREADS - 1 to keep a thread
+free for ordinary requests. The API servers therefore take at most
+WEB_CONCURRENCY x (GUNICORN_THREADS - 1) streams; that is deliberate, and
+clients turned away with 503 keep polling. To stream to every open
+dashboard, run a second server for /api/events on gevent, where a stream
+is a greenlet and the cap is GUNICORN_WORKER_CONNECTIONS - 1:
+
+    pip install gevent
+    GUNICORN_WORKER_CLASS=gevent GUNICORN_BIND=0.0.0.0:5001 WEB_CONCURRENCY=2 \
+        GUNICORN_PIDFILE=gunicorn-events.pid gunicorn -c gunicorn.conf.py wsgi:app
+
+and have the reverse proxy send /api/events there (with buffering off).
+
+Graceful reload: kill -HUP $(cat gunicorn.pid) starts new workers with
+freshly imported code and lets the old ones finish their in-flight
+requests (up to graceful_timeout) before they exit. That only picks up
+new code while preload_app is off; with GUNICORN_PRELOAD=1 the master
+holds the imported app and a full restart is needed.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:" + os.getenv("PORT", "5000"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")  # gthread | gevent (event streams, see above)
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+# Read by create_app() in every worker; see the docstring.
+stream_slots = (worker_connections if worker_class == "gevent" else threads) - 1
+os.environ["EVENTS_MAX_CLIENTS"] = str(min(int(os.getenv("EVENTS_MAX_CLIENTS", stream_slots)), stream_slots))
+
+# Import the app once in the master and fork it (faster start, shared
+# memory); post_fork then gives each worker its own connections and pools.
+preload_app = os.getenv("GUNICORN_PRELOAD", "0") == "1"
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+# Recycle workers now and then so slow leaks cannot build up; the jitter
+# keeps them from all restarting at once.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = max_requests // 10
+
+pidfile = os.getenv("GUNICORN_PIDFILE", "gunicorn.pid")
+accesslog = "-"
+# gunicorn's default format minus the query string: /api/events takes the
+# access token as ?jwt= (EventSource cannot send headers), and tokens must
+# not end up in logs.
+access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(m)s %(U)s %(H)s" %(s)s %(b)s "%(f)s" "%(a)s"'
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        from app import after_fork
+        after_fork(server.app.wsgi())
@@ -0,0 +1,62 @@
+from collections import namedtuple
+from flask import g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from cache import MemoryBackend
+from model import db, User
+
+Identity = namedtuple("Identity", "id role email name")
+CachedUser = namedtuple("CachedUser", "id full_name email role room_no")
+
+_users = MemoryBackend(4096)
+_ttl = 60
+
+
+def init_app(app):
+    global _ttl
+    _ttl = app.config.get("USER_CACHE_TTL", 60)
+
+
+def current_identity():
+    """
+    The caller as described by the access token's claims (see auth._claims),
+    built once per request. Needs no database access.
+    """
+    claims = get_jwt()
+    cached = g.get("_identity")
+    # g outlives the request when an app context was already pushed, so tie
+    # the memo to the decoded token it came from.
+    if cached is not None and cached[0] is claims:
+        return cached[1]
+    ident = Identity(int(get_jwt_identity()), claims.get("role"), claims.get("email"), claims.get("name"))
+    g._identity = (claims, ident)
+    return ident
+
+
+def get_user(user_id):
+    """
+    Current profile for ``user_id``, served from a short-TTL cache. Call
+    invalidate_user() whenever the row changes.
+    """
+    user = _users.get("user", user_id) if _ttl else None
+    if user is None:
+        row = db.session.query(User.id, User.full_name, User.email, User.role, User.room_no) \
+            .filter(User.id == user_id).first()
+        if row is None:
+            return None
+        user = CachedUser(*row)
+        if _ttl:
+            _users.set("user", user_id, user, _ttl)
+    return user
+
+
+def invalidate_user(user_id):
+    _users.delete("user", user_id)
+
+
+def is_owner(issue):
+    """Whether the caller reported ``issue``, by user id (or by name on issues filed before reporter_id existed)."""
+    ident = current_identity()
+    if issue.reporter_id is not None:
+        return issue.reporter_id == ident.id
+    user = get_user(ident.id)
+    return user is not None and user.full_name == issue.created_by
@@ -1,63 +1,163 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
-from model import db, Issue, User
+from flask_jwt_extended import jwt_required
+from model import db, Issue, IssueVote, User
+from sqlalchemy import or_, exists
+from sqlalchemy.exc import IntegrityError
 import datetime
+import base64
+import rollups
+import events
+from triage import triage_service
+from versions import conditional, next_seq
+from identity import current_identity, is_owner
+from duplicates import duplicate_index
+from serializers import ISSUE, ASSIGNED_ISSUE
 
 issues_bp = Blueprint("issues", __name__, url_prefix="/api")
 
 def role_required(*roles):
     def wrapper(fn):
         def inner(*args, **kwargs):
-            claims = get_jwt()
-            if claims.get("role") not in roles:
+            if current_identity().role not in roles:
                 return jsonify({"error": "Forbidden"}), 403
             return fn(*args, **kwargs)
         inner.__name__ = fn.__name__
         return jwt_required()(inner)
     return wrapper
 
+ISSUES_PAGE_SIZE = 50
+ISSUES_MAX_PAGE_SIZE = 200
+
+
+ISSUE_COLUMNS = (
+    Issue.id,
+    Issue.title,
+    Issue.description,
+    Issue.room_number,
+    Issue.status,
+    Issue.created_by,
+    Issue.created_at,
+    Issue.upvotes,
+    Issue.assigned_to,
+    Issue.assigned_at,
+    Issue.sentiment,
+    Issue.priority,
+    Issue.change_seq,
+)
+
+
+def issue_list_query(user_id):
+    """Projection of the columns the issue list needs, with the assignee name joined in
+    and whether ``user_id`` has voted computed in SQL."""
+    has_voted = exists().where(IssueVote.issue_id == Issue.id, IssueVote.user_id == user_id)
+    return (
+        db.session.query(*ISSUE_COLUMNS, User.full_name.label("assignee_name"), has_voted.label("has_voted"))
+        .outerjoin(User, User.id == Issue.assigned_to)
+    )
+
+
+def _encode_cursor(issue):
+    raw = f"{issue.created_at.isoformat()}|{issue.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    created_at, issue_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+    return datetime.datetime.fromisoformat(created_at), int(issue_id)
+
+
 @issues_bp.get("/issues")
 @jwt_required()
+@conditional("issue", "issue_vote", "user")
 def get_issues():
-    issues = Issue.query.filter(Issue.status != "Cancelled").order_by(Issue.created_at.desc()).all()
-    return jsonify([
-        {
-            "id": i.id,
-            "title": i.title,
-            "description": i.description,
-            "roomNumber": i.room_number,
-            "status": i.status,
-            "createdBy": i.created_by,
-            "createdAt": i.created_at.isoformat(),
-            "upvotes": i.upvotes,
-            "voters": i.voters.split(",") if i.voters else [],
-            "assignedTo": i.assigned_to,
-            "assignedWorker": i.assignee.full_name if i.assignee else None,
-            "assignedAt": i.assigned_at.isoformat() if i.assigned_at else None,
-            "assignee": i.assigned_to,
-            "assigneeName": i.assignee.full_name if i.assignee else None,
-        }
-        for i in issues
-    ])
+    """
+    Keyset-paginated issue list, newest first.
+
+    Query params: limit, cursor, status, room, assignee, created_by.
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    args = request.args
+    try:
+        limit = min(max(int(args.get("limit", ISSUES_PAGE_SIZE)), 1), ISSUES_MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"error": "Invalid limit"}), 400
+
+    query = issue_list_query(current_identity().id)
+    status = args.get("status")
+    if status:
+        query = query.filter(Issue.status == status)
+    else:
+        query = query.filter(Issue.status != "Cancelled")
+    if args.get("room"):
+        query = query.filter(Issue.room_number == args["room"])
+    if args.get("assignee"):
+        try:
+            query = query.filter(Issue.assigned_to == int(args["assignee"]))
+        except ValueError:
+            return jsonify({"error": "Invalid assignee"}), 400
+    if args.get("created_by"):
+        query = query.filter(Issue.created_by == args["created_by"])
+
+    cursor = args.get("cursor")
+    if cursor:
+        try:
+            after_ts, after_id = _decode_cursor(cursor)
+        except Exception:
+            return jsonify({"error": "Invalid cursor"}), 400
+        # created_at <= ts bounds the index range; the OR breaks ties on id.
+        query = query.filter(
+            Issue.created_at <= after_ts,
+            or_(Issue.created_at < after_ts, Issue.id < after_id),
+        )
+
+    issues = query.order_by(Issue.created_at.desc(), Issue.id.desc()).limit(limit + 1).all()
+    next_cursor = _encode_cursor(issues[limit - 1]) if len(issues) > limit else None
+    issues = issues[:limit]
+
+    resp = jsonify(ISSUE.dump_all(issues))
+    if next_cursor:
+        resp.headers["X-Next-Cursor"] = next_cursor
+    return resp
 
 
 @issues_bp.post("/issues")
 @role_required("student", "admin")
 def create_issue():
-    claims = get_jwt()
     data = request.get_json() or {}
 
     if not all([data.get("title"), data.get("description"), data.get("roomNumber")]):
         return jsonify({"error": "Missing fields"}), 400
+    # Clients have sent numeric room numbers; the columns and the duplicate index take text.
+    title, description, room_number = (str(data[k]) for k in ("title", "description", "roomNumber"))
+
+    # Offer to upvote an open look-alike on the same floor instead; the
+    # client re-sends with "force": true to file it anyway.
+    if not data.get("force"):
+        similar = duplicate_index.find(title, description, room_number)
+        if similar:
+            scores = {s["id"]: s["similarity"] for s in similar}
+            rows = issue_list_query(current_identity().id).filter(Issue.id.in_(scores)).all()
+            duplicates = sorted(
+                ({**ISSUE.dump(r), "similarity": scores[r.id]} for r in rows),
+                key=lambda d: -d["similarity"],
+            )
+            return jsonify({"error": "Possible duplicate", "duplicates": duplicates}), 409
 
     issue = Issue(
-        title=data["title"],
-        description=data["description"],
-        room_number=data["roomNumber"],
+        title=title,
+        description=description,
+        room_number=room_number,
         created_by=data['createdBy'],
+        reporter_id=current_identity().id,
+        change_seq=next_seq(),
     )
     db.session.add(issue)
+    db.session.flush()
+    rollups.record_issue_created(issue)
+    events.publish("issue.created", {"id": issue.id, "status": issue.status})
     db.session.commit()
+    triage_service.submit(issue.title, issue.description, issue.id)
     return jsonify({"message": "Issue created", "id": issue.id}), 201
 @issues_bp.route("/issues/<int:issue_id>", methods=["PUT"])
 @jwt_required()
@@ -73,28 +173,16 @@ def update_issue(issue_id):
     if not issue:
         return jsonify({"error": "Issue not found"}), 404
 
-    claims = get_jwt()
-    req_id = int(get_jwt_identity())  
-
-    req_id = User.query.filter_by(id=req_id).first().full_name
-    
-    is_owner = False
-    if isinstance(req_id, str):
-        is_owner = req_id == issue.created_by
-    else:
-        is_owner = str(req_id) == str(issue.created_by)
-
-    is_admin = claims.get("role") == "admin"
-
-    if not (is_owner or is_admin):
+    if not (current_identity().role == "admin" or is_owner(issue)):
         return jsonify({"error": "Forbidden"}), 403
 
-
-    issue.title = title
-    issue.description = description
-    issue.room_number = room_number
+    issue.title = str(title)
+    issue.description = str(description)
+    issue.room_number = str(room_number)
+    issue.change_seq = next_seq()
 
     db.session.commit()
+    triage_service.submit(issue.title, issue.description, issue.id)
 
     return jsonify({"message": "Issue updated", "id": issue.id}), 200
 
@@ -106,34 +194,47 @@ def update_status(issue_id):
     if not new_status:
         return jsonify({"error": "Missing status"}), 400
     issue = Issue.query.get_or_404(issue_id)
+    old_status = issue.status
     issue.status = new_status
+    issue.change_seq = next_seq()
+    rollups.record_issue_status_change(issue, old_status)
+    events.publish("issue.status", {"id": issue.id, "status": issue.status}, worker_id=issue.assigned_to)
     db.session.commit()
     return jsonify({"message": "Status updated"})
 
 @issues_bp.post("/issues/<int:issue_id>/upvote")
 @role_required("student", "admin")
 def toggle_upvote(issue_id):
-    claims = get_jwt()
-    email = claims.get("email")
-    issue = Issue.query.get_or_404(issue_id)
-
-    voters = set(filter(None, (issue.voters or "").split(",")))
+    user_id = current_identity().id
+    if not db.session.query(exists().where(Issue.id == issue_id)).scalar():
+        return jsonify({"error": "Issue not found"}), 404
 
-    if email in voters:
-        voters.remove(email)
-        message = "Upvote removed"
+    removed = IssueVote.query.filter_by(issue_id=issue_id, user_id=user_id).delete(synchronize_session=False)
+    if removed:
+        Issue.query.filter_by(id=issue_id).update(
+            {Issue.upvotes: Issue.upvotes - removed, Issue.change_seq: next_seq()}, synchronize_session=False
+        )
+        message, has_voted = "Upvote removed", False
     else:
-        voters.add(email)
-        message = "Upvoted successfully"
-
-    issue.voters = ",".join(voters)
-    issue.upvotes = len(voters)
+        try:
+            with db.session.begin_nested():
+                db.session.add(IssueVote(issue_id=issue_id, user_id=user_id))
+            Issue.query.filter_by(id=issue_id).update(
+                {Issue.upvotes: Issue.upvotes + 1, Issue.change_seq: next_seq()}, synchronize_session=False
+            )
+        except IntegrityError:
+            # A concurrent request already recorded this vote; the counter was bumped there.
+            pass
+        message, has_voted = "Upvoted successfully", True
+
+    upvotes, assigned_to = db.session.query(Issue.upvotes, Issue.assigned_to).filter_by(id=issue_id).one()
+    events.publish("issue.upvotes", {"id": issue_id, "upvotes": upvotes}, worker_id=assigned_to)
     db.session.commit()
 
     return jsonify({
         "message": message,
-        "upvotes": issue.upvotes,
-        "voters": list(voters)
+        "upvotes": upvotes,
+        "hasVoted": has_voted,
     })
 
 @issues_bp.post("/issues/<int:issue_id>/assign")
@@ -147,8 +248,13 @@ def assign_issue(issue_id):
     issue = Issue.query.get_or_404(issue_id)
     assignee = User.query.get(assignee_id)
 
+    previous = issue.assigned_to
     issue.assigned_to = assignee_id
     issue.assigned_at = datetime.datetime.utcnow()
+    issue.change_seq = next_seq()
+    if previous and previous != assignee.id:
+        events.publish("issue.unassigned", {"id": issue.id}, worker_id=previous)
+    events.publish("issue.assigned", {"id": issue.id, "assignedTo": assignee.id, "assigneeName": assignee.full_name}, worker_id=assignee.id)
     db.session.commit()
 
     return jsonify({
@@ -159,35 +265,25 @@ def assign_issue(issue_id):
 
 @issues_bp.get("/my-issues")
 @role_required("worker")
+@conditional("issue", "user")
 def get_my_issues():
-    claims = get_jwt()
-    worker_email = claims.get("email")
-    worker = User.query.filter_by(email=worker_email).first()
-    if not worker:
-        return jsonify([])
-
-    issues = Issue.query.filter_by(assigned_to=worker.id).order_by(Issue.created_at.desc()).all()
-    return jsonify([
-        {
-            "id": i.id,
-            "title": i.title,
-            "description": i.description,
-            "roomNumber": i.room_number,
-            "status": i.status,
-            "createdBy": i.created_by,
-            "createdAt": i.created_at.isoformat(),
-            "upvotes": i.upvotes,
-            "voters": i.voters.split(",") if i.voters else [],
-            "assignedTo": i.assigned_to,
-        } for i in issues
-    ])
+    issues = (
+        db.session.query(*ISSUE_COLUMNS)
+        .filter(Issue.assigned_to == current_identity().id)
+        .order_by(Issue.created_at.desc())
+        .all()
+    )
+    return jsonify(ASSIGNED_ISSUE.dump_all(issues))
 
 @issues_bp.post("/issues/<int:issue_id>/unassign")
 @role_required("admin")
 def unassign_issue(issue_id):
     issue = Issue.query.get_or_404(int(issue_id))
+    previous = issue.assigned_to
     issue.assigned_to = None
     issue.assigned_at = None
+    issue.change_seq = next_seq()
+    events.publish("issue.unassigned", {"id": issue.id}, worker_id=previous)
     db.session.commit()
     return jsonify({"message": "Worker unassigned successfully"}), 200
 
@@ -201,36 +297,18 @@ def delete_issue(issue_id):
     if not issue:
         return jsonify({"error": "Issue not found"}), 404
 
-    claims = get_jwt()
-    requester = get_jwt_identity()
-
-    try:
-        req_user = None
-        try:
-            requester_id = int(requester)
-            req_user = User.query.filter_by(id=requester_id).first()
-        except Exception:
-            req_user = User.query.filter_by(email=str(requester)).first() or User.query.filter_by(full_name=str(requester)).first()
-
-        requester_name = req_user.full_name if req_user else str(requester)
-    except Exception:
-        requester_name = str(requester)
-
-    is_owner = False
-    if isinstance(requester_name, str):
-        is_owner = requester_name == issue.created_by
-    else:
-        is_owner = str(requester_name) == str(issue.created_by)
-
-    is_admin = claims.get("role") == "admin"
-
-    if not (is_owner or is_admin):
+    if not (current_identity().role == "admin" or is_owner(issue)):
         return jsonify({"error": "Forbidden"}), 403
 
+    old_status = issue.status
     issue.status = "Cancelled"
+    rollups.record_issue_status_change(issue, old_status)
 
+    previous = issue.assigned_to
     issue.assigned_to = None
     issue.assigned_at = None
+    issue.change_seq = next_seq()
+    events.publish("issue.cancelled", {"id": issue.id}, worker_id=previous)
 
     db.session.commit()
 
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt
 from model import db, Doctor, StudentMedical
+from cache import response_cache
+from versions import conditional
+from serializers import DOCTOR, STUDENT_RECORD, stream_array
 import re
 
 medical_bp = Blueprint("medical", __name__, url_prefix="/api/medical")
@@ -10,18 +13,11 @@ TIME_RE = re.compile(r"^([01]?\d|2[0-3]):([0-5]\d)$")
 # --- Doctors ---
 @medical_bp.get("/doctors")
 @jwt_required(optional=True)
+@conditional("doctor")
+@response_cache.cached("doctors")
 def get_doctors():
     doctors = Doctor.query.all()
-    return jsonify([
-        {
-            "id": d.id,
-            "name": d.name,
-            "available_today": bool(d.available_today),
-            "arrival_time": d.arrival_time,
-            "leave_time": d.leave_time,
-        }
-        for d in doctors
-    ])
+    return jsonify(DOCTOR.dump_all(doctors))
 
 
 @medical_bp.post("/doctors")
@@ -47,6 +43,7 @@ def create_doctor():
     d = Doctor(name=name, available_today=available, arrival_time=arrival, leave_time=leave)
     db.session.add(d)
     db.session.commit()
+    response_cache.invalidate("doctors")
     return jsonify({"message": "Doctor created", "doctor": {"id": d.id}}), 201
 
 
@@ -79,6 +76,7 @@ def update_doctor(doc_id):
         d.leave_time = leave
 
     db.session.commit()
+    response_cache.invalidate("doctors")
     return jsonify({"message": "Doctor updated"})
 
 
@@ -95,6 +93,7 @@ def delete_doctor(doc_id):
 
     db.session.delete(d)
     db.session.commit()
+    response_cache.invalidate("doctors")
     return jsonify({"message": "Doctor deleted"})
 
 
@@ -106,16 +105,10 @@ def get_students():
     if claims.get("role") != "admin":
         return jsonify({"error": "Admins only"}), 403
 
-    recs = StudentMedical.query.all()
-    return jsonify([
-        {
-            "id": r.id,
-            "student_name": r.student_name,
-            "email": r.email,
-            "prescribed_medicine": r.prescribed_medicine,
-        }
-        for r in recs
-    ])
+    records = db.session.query(
+        StudentMedical.id, StudentMedical.student_name, StudentMedical.email, StudentMedical.prescribed_medicine
+    ).order_by(StudentMedical.id).yield_per(1000)
+    return stream_array(records, STUDENT_RECORD)
 
 
 @medical_bp.post("/student-records") # Changed from /students
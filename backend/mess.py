@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt
 from model import db, Mess
+from cache import response_cache
+from versions import conditional
+from serializers import MESS
 import datetime
 
 mess_bp = Blueprint("mess", __name__, url_prefix="/api")
@@ -20,22 +23,12 @@ def role_required(*roles):
 
 @mess_bp.get("/mess")
 @jwt_required()
+@conditional("mess")
+@response_cache.cached("mess")
 def get_mess_schedule():
     """Get the weekly mess schedule - visible to all authenticated users"""
     mess_items = Mess.query.all()
-    return jsonify([
-        {
-            "id": item.id,
-            "day": item.day,
-            "breakfast": item.breakfast,
-            "lunch": item.lunch,
-            "snacks": item.snacks,
-            "dinner": item.dinner,
-            "createdAt": item.created_at.isoformat(),
-            "updatedAt": item.updated_at.isoformat(),
-        }
-        for item in mess_items
-    ])
+    return jsonify(MESS.dump_all(mess_items))
 
 
 @mess_bp.post("/mess")
@@ -66,18 +59,9 @@ def create_mess_item():
                 pass
 
             db.session.commit()
+            response_cache.invalidate("mess")
 
-            return jsonify({
-                "message": "Mess item updated",
-                "id": existing.id,
-                "day": existing.day,
-                "breakfast": existing.breakfast,
-                "lunch": existing.lunch,
-                "snacks": existing.snacks,
-                "dinner": existing.dinner,
-                "createdAt": existing.created_at.isoformat(),
-                "updatedAt": getattr(existing, "updated_at", existing.created_at).isoformat(),
-            }), 200
+            return jsonify({"message": "Mess item updated", **MESS.dump(existing)}), 200
 
         mess_item = Mess(
             day=day,
@@ -88,18 +72,9 @@ def create_mess_item():
         )
         db.session.add(mess_item)
         db.session.commit()
+        response_cache.invalidate("mess")
 
-        return jsonify({
-            "message": "Mess item created",
-            "id": mess_item.id,
-            "day": mess_item.day,
-            "breakfast": mess_item.breakfast,
-            "lunch": mess_item.lunch,
-            "snacks": mess_item.snacks,
-            "dinner": mess_item.dinner,
-            "createdAt": mess_item.created_at.isoformat(),
-            "updatedAt": getattr(mess_item, "updated_at", mess_item.created_at).isoformat(),
-        }), 201
+        return jsonify({"message": "Mess item created", **MESS.dump(mess_item)}), 201
 
     except Exception as e:
         db.session.rollback()
@@ -137,17 +112,9 @@ def update_mess_item(mess_id):
         
         mess_item.updated_at = datetime.datetime.utcnow()
         db.session.commit()
+        response_cache.invalidate("mess")
         
-        return jsonify({
-            "id": mess_item.id,
-            "day": mess_item.day,
-            "breakfast": mess_item.breakfast,
-            "lunch": mess_item.lunch,
-            "snacks": mess_item.snacks,
-            "dinner": mess_item.dinner,
-            "createdAt": mess_item.created_at.isoformat(),
-            "updatedAt": mess_item.updated_at.isoformat(),
-        }), 200
+        return jsonify(MESS.dump(mess_item)), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 400
@@ -165,6 +132,7 @@ def delete_mess_item(mess_id):
     try:
         db.session.delete(mess_item)
         db.session.commit()
+        response_cache.invalidate("mess")
         return jsonify({"message": "Mess item deleted successfully"}), 200
     except Exception as e:
         db.session.rollback()
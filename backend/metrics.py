@@ -0,0 +1,197 @@
+import bisect
+import hmac
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode
+from flask import Blueprint, Response, current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+metrics_bp = Blueprint("metrics", __name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_SQL_KEPT = 5
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "n")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.n = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.n += 1
+
+
+class RequestMetrics:
+    """
+    Per-route request latency, status, response size and SQL statement
+    count/time, kept in process memory and served as Prometheus text at
+    /metrics. Routes are labelled by their URL rule (e.g.
+    /api/issues/<int:issue_id>), so label cardinality stays fixed.
+
+    With METRICS_SLOW_REQUEST_MS set, requests slower than that are logged
+    with their slowest statements.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.slow_ms = 0
+        self.token = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.requests = defaultdict(int)             # (route, method, status) -> count
+        self.latency = defaultdict(_Histogram)       # (route, method) -> histogram
+        self.response_bytes = defaultdict(int)       # (route, method) -> bytes
+        self.sql_statements = defaultdict(int)       # (route, method) -> statements
+        self.sql_seconds = defaultdict(float)        # (route, method) -> seconds
+        self.slow_requests = defaultdict(int)        # (route, method) -> count
+
+    def init_app(self, app):
+        self.enabled = app.config.get("METRICS_ENABLED", True)
+        self.slow_ms = app.config.get("METRICS_SLOW_REQUEST_MS", 0)
+        self.token = app.config.get("METRICS_TOKEN")
+        if not self.enabled:
+            return
+        app.before_request(self._before)
+        app.after_request(self._after)
+        if event.contains(Engine, "before_cursor_execute", _before_cursor):
+            return  # another app in this process already hooked the engines
+        event.listen(Engine, "before_cursor_execute", _before_cursor)
+        event.listen(Engine, "after_cursor_execute", _after_cursor)
+        event.listen(Engine, "handle_error", _failed_cursor)
+
+    def _before(self):
+        # [start, statements, sql seconds, slowest statements]
+        g._metrics = [time.perf_counter(), 0, 0.0, []]
+
+    def _after(self, response):
+        state = g.pop("_metrics", None)
+        if state is None:
+            return response
+        elapsed = time.perf_counter() - state[0]
+        rule = request.url_rule
+        key = (rule.rule if rule is not None else "unmatched", request.method)
+        size = response.content_length
+        with self._lock:
+            self.requests[(*key, response.status_code)] += 1
+            self.latency[key].observe(elapsed)
+            if size:
+                self.response_bytes[key] += size
+            self.sql_statements[key] += state[1]
+            self.sql_seconds[key] += state[2]
+            slow = self.slow_ms and elapsed * 1000 >= self.slow_ms
+            if slow:
+                self.slow_requests[key] += 1
+        if slow:
+            statements = "".join(
+                f"\n  {seconds * 1000:.1f} ms: {' '.join(sql.split())[:500]}"
+                for seconds, sql in sorted(state[3], reverse=True)
+            )
+            current_app.logger.warning(
+                "slow request %s %s -> %s in %.1f ms (%d statements, %.1f ms SQL)%s",
+                request.method, _logged_path(), response.status_code,
+                elapsed * 1000, state[1], state[2] * 1000, statements,
+            )
+        return response
+
+    def render(self):
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def labels(route, method, **extra):
+            pairs = [("route", route), ("method", method), *extra.items()]
+            return ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs)
+
+        with self._lock:
+            family("http_requests_total", "counter", "Requests by route, method and status.")
+            for (route, method, status), n in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{{{labels(route, method, status=status)}}} {n}")
+
+            family("http_request_duration_seconds", "histogram", "Time to build the response.")
+            for (route, method), h in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, h.counts):
+                    cumulative += count
+                    lines.append(f"http_request_duration_seconds_bucket{{{labels(route, method, le=bound)}}} {cumulative}")
+                lines.append(f"http_request_duration_seconds_bucket{{{labels(route, method, le='+Inf')}}} {h.n}")
+                lines.append(f"http_request_duration_seconds_sum{{{labels(route, method)}}} {h.total:.6f}")
+                lines.append(f"http_request_duration_seconds_count{{{labels(route, method)}}} {h.n}")
+
+            for name, help_text, values in (
+                ("http_response_bytes_total", "Response body bytes (streamed bodies not counted).", self.response_bytes),
+                ("db_statements_total", "SQL statements executed while handling requests.", self.sql_statements),
+                ("db_statement_seconds_total", "Time spent in SQL statements while handling requests.", self.sql_seconds),
+                ("http_slow_requests_total", "Requests over METRICS_SLOW_REQUEST_MS.", self.slow_requests),
+            ):
+                family(name, "counter", help_text)
+                for (route, method), v in sorted(values.items()):
+                    lines.append(f"{name}{{{labels(route, method)}}} {v:.6f}" if isinstance(v, float)
+                                 else f"{name}{{{labels(route, method)}}} {v}")
+        return "\n".join(lines) + "\n"
+
+
+def _logged_path():
+    # /api/events takes the access token as ?jwt=; keep it out of the log.
+    query = urlencode([(k, v) for k, v in request.args.items(multi=True) if k != "jwt"])
+    return f"{request.path}?{query}" if query else request.path
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _before_cursor(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_metrics_start", []).append(time.perf_counter())
+
+
+def _failed_cursor(context):
+    starts = context.connection.info.get("_metrics_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def _after_cursor(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["_metrics_start"].pop()
+    if not has_request_context():
+        return
+    state = g.get("_metrics")
+    if state is None:
+        return
+    seconds = time.perf_counter() - started
+    state[1] += 1
+    state[2] += seconds
+    if request_metrics.slow_ms:
+        slowest = state[3]
+        if len(slowest) < SLOW_SQL_KEPT:
+            slowest.append((seconds, statement))
+        elif seconds > min(slowest)[0]:
+            slowest.remove(min(slowest))
+            slowest.append((seconds, statement))
+
+
+request_metrics = RequestMetrics()
+
+
+@metrics_bp.get("/metrics")
+def metrics():
+    """Needs METRICS_TOKEN as a bearer token, or an admin's access token when no METRICS_TOKEN is set."""
+    if request_metrics.token:
+        allowed = hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {request_metrics.token}")
+    else:
+        verify_jwt_in_request()
+        allowed = get_jwt().get("role") == "admin"
+    if not allowed:
+        return Response("Forbidden\n", status=403, mimetype="text/plain")
+    return Response(request_metrics.render(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,46 @@
+"""add indexes for hot filter and sort columns
+
+Revision ID: 3f2a9c1d7e40
+Revises:
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7e40'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_issue_created_at_id', 'issue', ['created_at', 'id']),
+    ('ix_issue_status_created_at', 'issue', ['status', 'created_at', 'id']),
+    ('ix_issue_assigned_to_created_at', 'issue', ['assigned_to', 'created_at', 'id']),
+    ('ix_issue_created_by_created_at', 'issue', ['created_by', 'created_at', 'id']),
+    ('ix_issue_room_number_created_at', 'issue', ['room_number', 'created_at', 'id']),
+    ('ix_student_medical_email', 'student_medical', ['email']),
+    ('ix_bus_timetable_route_name', 'bus_timetable', ['route_name']),
+]
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade():
+    # Tables are still created by db.create_all(); only index the ones present.
+    tables = _existing_tables()
+    for name, table, columns in INDEXES:
+        if table in tables:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    tables = _existing_tables()
+    for name, table, _ in reversed(INDEXES):
+        if table in tables:
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,46 @@
+"""add issue sentiment and priority
+
+Revision ID: 8b61d0e5a2c7
+Revises: 3f2a9c1d7e40
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b61d0e5a2c7'
+down_revision = '3f2a9c1d7e40'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = ('sentiment', 'priority')
+
+
+def _issue_columns():
+    inspector = sa.inspect(op.get_bind())
+    if 'issue' not in inspector.get_table_names():
+        return None
+    return {c['name'] for c in inspector.get_columns('issue')}
+
+
+def upgrade():
+    existing = _issue_columns()
+    if existing is None:
+        return
+    with op.batch_alter_table('issue') as batch_op:
+        for name in COLUMNS:
+            if name not in existing:
+                batch_op.add_column(sa.Column(name, sa.String(length=10), nullable=True))
+
+
+def downgrade():
+    existing = _issue_columns()
+    if existing is None:
+        return
+    with op.batch_alter_table('issue') as batch_op:
+        for name in COLUMNS:
+            if name in existing:
+                batch_op.drop_column(name)
@@ -0,0 +1,41 @@
+"""add issue.triage_source
+
+Revision ID: a6d2f8c41e93
+Revises: f3a91c6b2d48
+Create Date: 2026-10-18 01:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d2f8c41e93'
+down_revision = 'f3a91c6b2d48'
+branch_labels = None
+depends_on = None
+
+
+def _issue_columns():
+    inspector = sa.inspect(op.get_bind())
+    if 'issue' not in inspector.get_table_names():
+        return None
+    return {c['name'] for c in inspector.get_columns('issue')}
+
+
+def upgrade():
+    # Existing labels stay NULL: nothing records whether the API or the
+    # local classifier produced them, so they are not used for training.
+    existing = _issue_columns()
+    if existing is None or 'triage_source' in existing:
+        return
+    with op.batch_alter_table('issue') as batch_op:
+        batch_op.add_column(sa.Column('triage_source', sa.String(length=10), nullable=True))
+
+
+def downgrade():
+    existing = _issue_columns()
+    if existing is None or 'triage_source' not in existing:
+        return
+    with op.batch_alter_table('issue') as batch_op:
+        batch_op.drop_column('triage_source')
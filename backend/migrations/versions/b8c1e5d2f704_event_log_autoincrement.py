@@ -0,0 +1,37 @@
+"""never reuse event_log ids on SQLite
+
+Revision ID: b8c1e5d2f704
+Revises: a6d2f8c41e93
+Create Date: 2026-10-18 02:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8c1e5d2f704'
+down_revision = 'a6d2f8c41e93'
+branch_labels = None
+depends_on = None
+
+
+def _needs_rebuild(autoincrement):
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite' or 'event_log' not in sa.inspect(bind).get_table_names():
+        return False
+    sql = bind.exec_driver_sql("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'event_log'").scalar()
+    return ('AUTOINCREMENT' in sql.upper()) != autoincrement
+
+
+def upgrade():
+    # Other databases never reuse serial ids; on SQLite the table is rebuilt.
+    if _needs_rebuild(True):
+        with op.batch_alter_table('event_log', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+            pass
+
+
+def downgrade():
+    if _needs_rebuild(False):
+        with op.batch_alter_table('event_log', recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+            pass
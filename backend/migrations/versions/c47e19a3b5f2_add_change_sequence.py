@@ -0,0 +1,61 @@
+"""add change_seq to issue and notice
+
+Revision ID: c47e19a3b5f2
+Revises: 8b61d0e5a2c7
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47e19a3b5f2'
+down_revision = '8b61d0e5a2c7'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ('issue', 'notice')
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    if 'sync_counter' not in tables:
+        op.create_table(
+            'sync_counter',
+            sa.Column('name', sa.String(length=30), primary_key=True),
+            sa.Column('value', sa.Integer(), nullable=False),
+        )
+
+    for table in TABLES:
+        if table not in tables:
+            continue
+        if 'change_seq' not in {c['name'] for c in inspector.get_columns(table)}:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.add_column(sa.Column('change_seq', sa.Integer(), nullable=True))
+                batch_op.create_index(f'ix_{table}_change_seq', ['change_seq'], unique=False)
+
+    # Number existing rows so a first sync from 0 returns them: issues first,
+    # then notices, then start the counter after both.
+    seq = bind.execute(sa.text("SELECT value FROM sync_counter WHERE name = 'changes'")).scalar() or 0
+    for table in TABLES:
+        if table not in tables:
+            continue
+        bind.execute(sa.text(f"UPDATE {table} SET change_seq = id + :offset WHERE change_seq IS NULL"), {"offset": seq})
+        seq = max(seq, bind.execute(sa.text(f"SELECT MAX(change_seq) FROM {table}")).scalar() or 0)
+    bind.execute(sa.text("DELETE FROM sync_counter WHERE name = 'changes'"))
+    bind.execute(sa.text("INSERT INTO sync_counter (name, value) VALUES ('changes', :seq)"), {"seq": seq})
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for table in TABLES:
+        if table in tables and 'change_seq' in {c['name'] for c in inspector.get_columns(table)}:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.drop_index(f'ix_{table}_change_seq')
+                batch_op.drop_column('change_seq')
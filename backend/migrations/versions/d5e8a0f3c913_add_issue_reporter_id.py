@@ -0,0 +1,45 @@
+"""add issue.reporter_id
+
+Revision ID: d5e8a0f3c913
+Revises: c47e19a3b5f2
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5e8a0f3c913'
+down_revision = 'c47e19a3b5f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'issue' not in inspector.get_table_names():
+        return
+    if 'reporter_id' not in {c['name'] for c in inspector.get_columns('issue')}:
+        with op.batch_alter_table('issue') as batch_op:
+            batch_op.add_column(sa.Column('reporter_id', sa.Integer(), nullable=True))
+            batch_op.create_index('ix_issue_reporter_id', ['reporter_id'], unique=False)
+            batch_op.create_foreign_key('fk_issue_reporter_id_user', 'user', ['reporter_id'], ['id'])
+
+    # Existing issues only carry the reporter's name; link them where that
+    # name belongs to exactly one user. The rest keep the name-based check.
+    bind.execute(sa.text(
+        'UPDATE issue SET reporter_id = (SELECT u.id FROM "user" u WHERE u.full_name = issue.created_by) '
+        'WHERE reporter_id IS NULL '
+        'AND (SELECT COUNT(*) FROM "user" u WHERE u.full_name = issue.created_by) = 1'
+    ))
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'issue' in inspector.get_table_names() and 'reporter_id' in {c['name'] for c in inspector.get_columns('issue')}:
+        with op.batch_alter_table('issue') as batch_op:
+            batch_op.drop_constraint('fk_issue_reporter_id_user', type_='foreignkey')
+            batch_op.drop_index('ix_issue_reporter_id')
+            batch_op.drop_column('reporter_id')
@@ -0,0 +1,44 @@
+"""add assignment_log
+
+Revision ID: f3a91c6b2d48
+Revises: e2b7c4d9f061
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a91c6b2d48'
+down_revision = 'e2b7c4d9f061'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # On an empty database the referenced tables do not exist yet; init-db
+    # (create_all) then creates assignment_log along with them.
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'assignment_log' in tables or not {'issue', 'user'} <= tables:
+        return
+    op.create_table(
+        'assignment_log',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('issue_id', sa.Integer(), sa.ForeignKey('issue.id'), nullable=False),
+        sa.Column('worker_id', sa.Integer(), sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('worker_type', sa.String(length=100), nullable=False),
+        sa.Column('open_before', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_assignment_log_issue_id', 'assignment_log', ['issue_id'])
+    op.create_index('ix_assignment_log_worker_id', 'assignment_log', ['worker_id'])
+
+
+def downgrade():
+    if 'assignment_log' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.drop_index('ix_assignment_log_worker_id', table_name='assignment_log')
+    op.drop_index('ix_assignment_log_issue_id', table_name='assignment_log')
+    op.drop_table('assignment_log')
@@ -27,10 +27,44 @@ class Issue(db.Model):
     created_by = db.Column(db.String(50), nullable=False)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow)
     upvotes = db.Column(db.Integer, nullable=False, default=0)
-    voters = db.Column(db.Text, nullable=True, default='')
     assigned_to = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     assigned_at = db.Column(db.DateTime, nullable=True)
-    assignee = db.relationship("User", backref=db.backref("assigned_issues", lazy=True))
+    sentiment = db.Column(db.String(10), nullable=True)  # filled in by triage.py
+    priority = db.Column(db.String(10), nullable=True)
+    # "api" or "local": which produced sentiment/priority. Only API labels train the classifier.
+    triage_source = db.Column(db.String(10), nullable=True)
+    change_seq = db.Column(db.Integer, nullable=True, index=True)  # see sync.py
+    # Who filed the issue; created_by is only a display name. NULL on issues
+    # filed before this column existed that could not be matched to a user.
+    reporter_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True, index=True)
+    assignee = db.relationship("User", foreign_keys=[assigned_to], backref=db.backref("assigned_issues", lazy=True))
+    # Match the list/filter shapes in issues.py: each filter column followed by
+    # the (created_at, id) keyset ordering.
+    __table_args__ = (
+        db.Index('ix_issue_created_at_id', 'created_at', 'id'),
+        db.Index('ix_issue_status_created_at', 'status', 'created_at', 'id'),
+        db.Index('ix_issue_assigned_to_created_at', 'assigned_to', 'created_at', 'id'),
+        db.Index('ix_issue_created_by_created_at', 'created_by', 'created_at', 'id'),
+        db.Index('ix_issue_room_number_created_at', 'room_number', 'created_at', 'id'),
+    )
+
+class IssueVote(db.Model):
+    __tablename__ = 'issue_vote'
+    id = db.Column(db.Integer, primary_key=True)
+    issue_id = db.Column(db.Integer, db.ForeignKey('issue.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow)
+    __table_args__ = (db.UniqueConstraint('issue_id', 'user_id', name='unique_issue_voter'),)
+class IssueDailyStat(db.Model):
+    __tablename__ = 'issue_daily_stat'
+    day = db.Column(db.Date, primary_key=True)  # date the issues were created
+    status = db.Column(db.String(20), primary_key=True)  # their current status
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class ReporterStat(db.Model):
+    __tablename__ = 'reporter_stat'
+    reporter = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0, index=True)
 
 
 class Notice(db.Model):
@@ -39,6 +73,12 @@ class Notice(db.Model):
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow)
     author = db.Column(db.String(50), nullable=False, default='Admin')
+    change_seq = db.Column(db.Integer, nullable=True, index=True)
+
+class NoticeMonthlyStat(db.Model):
+    __tablename__ = 'notice_monthly_stat'
+    month = db.Column(db.String(7), primary_key=True)  # YYYY-MM
+    count = db.Column(db.Integer, nullable=False, default=0)
 
 class Mess(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -64,5 +104,38 @@ class StudentMedical(db.Model):
     __tablename__ = 'student_medical'
     id = db.Column(db.Integer, primary_key=True)
     student_name = db.Column(db.String(150), nullable=False)
-    email = db.Column(db.String(120), nullable=False)
-    prescribed_medicine = db.Column(db.Text, nullable=True)
\ No newline at end of file
+    email = db.Column(db.String(120), nullable=False, index=True)
+    prescribed_medicine = db.Column(db.Text, nullable=True)
+
+class TableVersion(db.Model):
+    __tablename__ = 'table_version'
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow)
+
+class EventLog(db.Model):
+    __tablename__ = 'event_log'
+    # AUTOINCREMENT: once pruning empties the table SQLite would otherwise
+    # hand out id 1 again, below every relay head and Last-Event-ID.
+    __table_args__ = {'sqlite_autoincrement': True}
+    id = db.Column(db.Integer, primary_key=True)  # doubles as the SSE event id
+    kind = db.Column(db.String(30), nullable=False)
+    worker_id = db.Column(db.Integer, nullable=True)  # assignee the event concerns, if any
+    payload = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow, index=True)
+
+class SyncCounter(db.Model):
+    __tablename__ = 'sync_counter'
+    name = db.Column(db.String(30), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+# One row per decision made by the automatic assigner (assignment.py).
+class AssignmentLog(db.Model):
+    __tablename__ = 'assignment_log'
+    id = db.Column(db.Integer, primary_key=True)
+    issue_id = db.Column(db.Integer, db.ForeignKey('issue.id'), nullable=False, index=True)
+    worker_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    category = db.Column(db.String(100), nullable=False)
+    worker_type = db.Column(db.String(100), nullable=False)
+    open_before = db.Column(db.Integer, nullable=False)  # worker's open assignments when picked
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow)
@@ -2,23 +2,22 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from model import db, Notice
 from issues import role_required 
+import rollups
+import events
+from cache import response_cache
+from versions import conditional, next_seq
+from serializers import NOTICE
 
 notices_bp = Blueprint("notices", __name__, url_prefix="/api")
 
 
 @notices_bp.get("/notices")
 @jwt_required()
+@conditional("notice")
+@response_cache.cached("notices")
 def get_notices():
     notices = Notice.query.order_by(Notice.created_at.desc()).all()
-    return jsonify([
-        {
-            "id": n.id,
-            "title": n.title,
-            "content": n.content,
-            "author": n.author,
-            "createdAt": n.created_at.isoformat()
-        } for n in notices
-    ])
+    return jsonify(NOTICE.dump_all(notices))
 
 
 @notices_bp.post("/notices")
@@ -27,9 +26,13 @@ def create_notice():
     data = request.get_json() or {}
     if not data.get("title") or not data.get("content"):
         return jsonify({"error": "Invalid input"}), 400
-    notice = Notice(title=data["title"], content=data["content"], author=data.get("author", "Admin"))
+    notice = Notice(title=data["title"], content=data["content"], author=data.get("author", "Admin"), change_seq=next_seq())
     db.session.add(notice)
+    db.session.flush()
+    rollups.record_notice_created(notice)
+    events.publish("notice.created", {"id": notice.id, "title": notice.title})
     db.session.commit()
+    response_cache.invalidate("notices")
     return jsonify({"message": "Notice created", "id": notice.id}), 201
 
 
@@ -49,5 +52,8 @@ def update_notice(notice_id):
 
     notice.title = title
     notice.content = content
+    notice.change_seq = next_seq()
+    events.publish("notice.updated", {"id": notice.id, "title": notice.title})
     db.session.commit()
+    response_cache.invalidate("notices")
     return jsonify({"message": "Notice updated successfully"}), 200
@@ -0,0 +1,100 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HasherBusy(Exception):
+    """Raised when more hash jobs are waiting than PASSWORD_HASH_QUEUE allows."""
+
+
+class PasswordHasher:
+    """
+    Hashes and checks passwords on a bounded pool so a burst of logins
+    queues up (and past PASSWORD_HASH_QUEUE waiting jobs is refused) instead
+    of pinning every request worker on key derivation. hashlib releases the
+    GIL while deriving, so the thread pool already uses several cores; the
+    process pool is there for interpreters where it doesn't.
+
+    PASSWORD_HASH_METHOD is any werkzeug method string, e.g. "scrypt:16384:8:1"
+    or "pbkdf2:sha256:310000". Stored hashes made with other parameters are
+    replaced on the next successful login (see needs_rehash).
+    """
+
+    def __init__(self):
+        self.method = "scrypt"
+        self.prefix = None
+        self.max_pending = 64
+        self.workers = 1
+        self._executor = None
+        self._slots = None
+        self._dummy = None
+
+    def init_app(self, app):
+        self.method = app.config.get("PASSWORD_HASH_METHOD", "scrypt")
+        workers = app.config.get("PASSWORD_HASH_WORKERS") or os.cpu_count() or 1
+        self.max_pending = app.config.get("PASSWORD_HASH_QUEUE", 64)
+        pool = app.config.get("PASSWORD_HASH_POOL", "thread")
+        if pool == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hasher")
+        elif pool == "process":
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            raise ValueError(f"Unknown PASSWORD_HASH_POOL {pool!r}")
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(workers + self.max_pending)
+        self.prefix = None
+        self._dummy = None
+
+    def _run(self, fn, *args):
+        if self._executor is None:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy()
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def hash_many(self, passwords):
+        """
+        Hash a batch in parallel. Waits for pool slots instead of raising
+        HasherBusy, and keeps at most ``workers`` jobs queued so logins still
+        get through during a bulk import.
+        """
+        if self._executor is None:
+            return [generate_password_hash(p, self.method) for p in passwords]
+        results = []
+        for i in range(0, len(passwords), self.workers):
+            futures = []
+            for password in passwords[i:i + self.workers]:
+                self._slots.acquire()
+                future = self._executor.submit(generate_password_hash, password, self.method)
+                future.add_done_callback(lambda f: self._slots.release())
+                futures.append(future)
+            results.extend(f.result() for f in futures)
+        return results
+
+    def verify(self, stored, password):
+        if stored is None:
+            # Unknown account: spend the same time as a real check so the
+            # response doesn't reveal which emails are registered.
+            if self._dummy is None:
+                self._dummy = self.hash("")
+            self._run(check_password_hash, self._dummy, password or "")
+            return False
+        return self._run(check_password_hash, stored, password or "")
+
+    def needs_rehash(self, stored):
+        """True when ``stored`` was made with a different method or cost than configured."""
+        if self.prefix is None:
+            # werkzeug fills in default parameters (e.g. "pbkdf2" -> "pbkdf2:sha256:1000000"),
+            # so take the canonical prefix from a real hash.
+            self.prefix = self.hash("").split("$", 1)[0]
+        return stored.split("$", 1)[0] != self.prefix
+
+
+hasher = PasswordHasher()
@@ -0,0 +1,63 @@
+import datetime
+from sqlalchemy import func
+from model import db, Issue, Notice, IssueDailyStat, ReporterStat, NoticeMonthlyStat
+from versions import upsert_for
+
+
+def _bump(model, delta, **key):
+    """Add ``delta`` to ``model.count`` for the row identified by ``key``, creating it if needed."""
+    insert = upsert_for(db.session.get_bind().dialect.name)
+    if insert is not None:
+        stmt = insert(model).values(count=delta, **key).on_conflict_do_update(
+            index_elements=list(key), set_={"count": model.count + delta}
+        )
+        db.session.execute(stmt)
+        return
+
+    updated = model.query.filter_by(**key).update({model.count: model.count + delta}, synchronize_session=False)
+    if not updated:
+        db.session.add(model(count=delta, **key))
+
+
+def record_issue_created(issue):
+    _bump(IssueDailyStat, 1, day=issue.created_at.date(), status=issue.status)
+    _bump(ReporterStat, 1, reporter=issue.created_by)
+
+
+def record_issue_status_change(issue, old_status):
+    if old_status == issue.status:
+        return
+    day = issue.created_at.date()
+    _bump(IssueDailyStat, -1, day=day, status=old_status)
+    _bump(IssueDailyStat, 1, day=day, status=issue.status)
+
+
+def record_notice_created(notice):
+    _bump(NoticeMonthlyStat, 1, month=notice.created_at.strftime("%Y-%m"))
+
+
+def _as_date(value):
+    return value if isinstance(value, datetime.date) else datetime.date.fromisoformat(str(value))
+
+
+def rebuild():
+    """Recompute every rollup table from the source tables."""
+    IssueDailyStat.query.delete()
+    ReporterStat.query.delete()
+    NoticeMonthlyStat.query.delete()
+
+    day = func.date(Issue.created_at)
+    for d, status, count in db.session.query(day, Issue.status, func.count(Issue.id)).group_by(day, Issue.status):
+        db.session.add(IssueDailyStat(day=_as_date(d), status=status, count=count))
+
+    for reporter, count in db.session.query(Issue.created_by, func.count(Issue.id)).group_by(Issue.created_by):
+        db.session.add(ReporterStat(reporter=reporter, count=count))
+
+    months = {}
+    for (created_at,) in db.session.query(Notice.created_at).yield_per(1000):
+        month = created_at.strftime("%Y-%m")
+        months[month] = months.get(month, 0) + 1
+    for month, count in months.items():
+        db.session.add(NoticeMonthlyStat(month=month, count=count))
+
+    db.session.commit()
@@ -0,0 +1,188 @@
+import html
+import re
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from sqlalchemy import event, text, or_
+from model import db, Issue, Notice
+
+search_bp = Blueprint("search", __name__, url_prefix="/api")
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 50
+
+# External-content FTS5 tables: the text lives only in issue/notice, the
+# index is kept in step by triggers (updates that don't touch the indexed
+# columns, like upvotes or status, skip them).
+FTS_TABLES = {
+    "issue_fts": ("issue", ("title", "description")),
+    "notice_fts": ("notice", ("title", "content")),
+}
+
+# Markers around matches in snippets; swapped for <mark> after HTML-escaping.
+_OPEN, _CLOSE = "\x02", "\x03"
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _ddl(fts, table, columns):
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, content='{table}', content_rowid='id', "
+        f"tokenize='porter unicode61', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+    ]
+
+
+def create_index(connection):
+    """Create the FTS tables and triggers if missing, indexing existing rows (SQLite only)."""
+    if connection.dialect.name != "sqlite":
+        return
+    for fts, (table, columns) in FTS_TABLES.items():
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts}
+        ).first()
+        for stmt in _ddl(fts, table, columns):
+            connection.execute(text(stmt))
+        if not exists:
+            connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def rebuild_index(connection):
+    """Drop and repopulate the FTS tables from issue and notice."""
+    if connection.dialect.name != "sqlite":
+        return
+    for fts in FTS_TABLES:
+        connection.execute(text(f"DROP TABLE IF EXISTS {fts}"))
+        for suffix in ("ai", "ad", "au"):
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {fts}_{suffix}"))
+    create_index(connection)
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Keep alembic autogenerate from dropping the FTS tables and their shadow tables."""
+    return not (type_ == "table" and any(name == fts or name.startswith(fts + "_") for fts in FTS_TABLES))
+
+
+@event.listens_for(db.metadata, "after_create")
+def _create_index_with_tables(target, connection, **kw):
+    create_index(connection)
+
+
+def match_query(q):
+    """
+    Turn free text into an FTS5 query: every word must match, the last one as
+    a prefix so results show up while typing. Quoting each word keeps FTS5
+    syntax characters in user input from raising errors.
+    """
+    words = TOKEN_RE.findall(q)
+    if not words:
+        return None
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _marked(snippet):
+    return html.escape(snippet or "").replace(_OPEN, "<mark>").replace(_CLOSE, "</mark>")
+
+
+SEARCH_SQL = {
+    "issues": f"""
+        SELECT 'issue' AS kind, issue.id AS id, issue.status AS status, issue.created_at AS created_at,
+               highlight(issue_fts, 0, '{_OPEN}', '{_CLOSE}') AS title,
+               snippet(issue_fts, 1, '{_OPEN}', '{_CLOSE}', '…', 16) AS snippet,
+               bm25(issue_fts, 5.0, 1.0) AS score
+        FROM issue_fts JOIN issue ON issue.id = issue_fts.rowid
+        WHERE issue_fts MATCH :q AND issue.status != 'Cancelled'
+    """,
+    "notices": f"""
+        SELECT 'notice' AS kind, notice.id AS id, NULL AS status, notice.created_at AS created_at,
+               highlight(notice_fts, 0, '{_OPEN}', '{_CLOSE}') AS title,
+               snippet(notice_fts, 1, '{_OPEN}', '{_CLOSE}', '…', 16) AS snippet,
+               bm25(notice_fts, 5.0, 1.0) AS score
+        FROM notice_fts JOIN notice ON notice.id = notice_fts.rowid
+        WHERE notice_fts MATCH :q
+    """,
+}
+
+
+def _search_fts(kinds, q, limit, offset):
+    sql = " UNION ALL ".join(SEARCH_SQL[k] for k in kinds) + " ORDER BY score LIMIT :limit OFFSET :offset"
+    stmt = text(sql).columns(created_at=db.DateTime)
+    rows = db.session.execute(stmt, {"q": q, "limit": limit, "offset": offset}).all()
+    return [
+        {
+            "type": r.kind,
+            "id": r.id,
+            "status": r.status,
+            "createdAt": r.created_at.isoformat(),
+            "title": _marked(r.title),
+            "snippet": _marked(r.snippet),
+        }
+        for r in rows
+    ]
+
+
+def _search_like(kinds, words, limit, offset):
+    # Databases without FTS5: every word as a substring, newest first.
+    results = []
+    sources = {
+        "issues": ("issue", Issue, Issue.description, Issue.status != "Cancelled"),
+        "notices": ("notice", Notice, Notice.content, None),
+    }
+    for kind in kinds:
+        name, model, body, extra = sources[kind]
+        query = model.query
+        for w in words:
+            query = query.filter(or_(model.title.ilike(f"%{w}%"), body.ilike(f"%{w}%")))
+        if extra is not None:
+            query = query.filter(extra)
+        for row in query.order_by(model.created_at.desc()).limit(offset + limit).all():
+            results.append({
+                "type": name,
+                "id": row.id,
+                "status": getattr(row, "status", None),
+                "createdAt": row.created_at.isoformat(),
+                "title": html.escape(row.title),
+                "snippet": html.escape(getattr(row, body.key)[:200]),
+            })
+    results.sort(key=lambda r: r["createdAt"], reverse=True)
+    return results[offset:offset + limit]
+
+
+@search_bp.get("/search")
+@jwt_required()
+def search():
+    """
+    Ranked search over issues and notices.
+
+    Query params: q, type (issues | notices, default both), limit, offset.
+    Titles and snippets are HTML-escaped with matches wrapped in <mark>.
+    """
+    args = request.args
+    try:
+        limit = min(max(int(args.get("limit", SEARCH_PAGE_SIZE)), 1), SEARCH_MAX_PAGE_SIZE)
+        offset = max(int(args.get("offset", 0)), 0)
+    except ValueError:
+        return jsonify({"error": "Invalid limit or offset"}), 400
+    kind = args.get("type")
+    if kind and kind not in SEARCH_SQL:
+        return jsonify({"error": "type must be issues or notices"}), 400
+    kinds = [kind] if kind else list(SEARCH_SQL)
+
+    q = match_query(args.get("q", ""))
+    if q is None:
+        return jsonify({"results": [], "more": False})
+
+    if db.engine.dialect.name == "sqlite":
+        results = _search_fts(kinds, q, limit + 1, offset)
+    else:
+        results = _search_like(kinds, TOKEN_RE.findall(args["q"]), limit + 1, offset)
+    return jsonify({"results": results[:limit], "more": len(results) > limit})
@@ -0,0 +1,51 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from model import Issue, Notice
+from issues import issue_list_query
+from serializers import ISSUE, SYNCED_NOTICE
+from versions import conditional
+from identity import current_identity
+
+sync_bp = Blueprint("sync", __name__, url_prefix="/api")
+
+SYNC_PAGE_SIZE = 500
+
+
+@sync_bp.get("/sync")
+@jwt_required()
+@conditional("issue", "issue_vote", "user", "notice")
+def get_changes():
+    """
+    Issues and notices changed after ?since=<seq>. Cancelled issues come back
+    as tombstones. Pass the returned ``seq`` as the next ``since``; ``more``
+    means another page is waiting.
+    """
+    try:
+        since = int(request.args.get("since", 0))
+        limit = min(max(int(request.args.get("limit", SYNC_PAGE_SIZE)), 1), SYNC_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"error": "Invalid since or limit"}), 400
+
+    issues = issue_list_query(current_identity().id) \
+        .filter(Issue.change_seq > since) \
+        .order_by(Issue.change_seq).limit(limit).all()
+    notices = Notice.query.filter(Notice.change_seq > since).order_by(Notice.change_seq).limit(limit).all()
+
+    # If either side filled its page, only return changes up to the lower of
+    # the two last sequence numbers so the next page starts without gaps.
+    more = len(issues) == limit or len(notices) == limit
+    if more:
+        cutoffs = [rows[-1].change_seq for rows in (issues, notices) if len(rows) == limit]
+        upto = min(cutoffs)
+        issues = [i for i in issues if i.change_seq <= upto]
+        notices = [n for n in notices if n.change_seq <= upto]
+    else:
+        upto = max([since] + [r.change_seq for r in (*issues, *notices)])
+
+    return jsonify({
+        "issues": ISSUE.dump_all(i for i in issues if i.status != "Cancelled"),
+        "notices": SYNCED_NOTICE.dump_all(notices),
+        "tombstones": {"issues": [i.id for i in issues if i.status == "Cancelled"]},
+        "seq": upto,
+        "more": more,
+    })
@@ -0,0 +1,215 @@
+import os
+import hashlib
+import json
+import re
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from cache import MemoryBackend
+from classifier import LocalClassifier
+from model import db, Issue
+from versions import next_seq
+
+SENTIMENTS = ("Happy", "Sad", "Angry")
+PRIORITIES = ("High", "Medium", "Low")
+DEFAULT_RESULT = {"sentiment": "Happy", "priority": "Low"}
+
+# api: remote model only; local: in-process classifier only;
+# fallback: remote model, local classifier when it fails;
+# first-pass: local answer immediately, refined by the remote model.
+ENGINES = ("api", "local", "fallback", "first-pass")
+
+
+def content_key(title, description):
+    return hashlib.sha256(f"{title}\0{description}".encode()).hexdigest()
+
+
+def build_prompt(title, description):
+    text = f"Title: {title}\nDescription: {description}"
+    return (
+        "Analyze the following issue and return only a valid JSON object with two keys: "
+        "'sentiment' and 'priority'.\n"
+        "Sentiment must be exactly one of ['Happy', 'Sad', 'Angry'].\n"
+        "Priority must be exactly one of ['High', 'Medium', 'Low'].\n"
+        "No explanations, no extra text.\n\n"
+        f"Issue:\n{text}"
+    )
+
+
+def parse_result(content):
+    """Pull sentiment/priority out of the model's reply, falling back to the defaults."""
+    content = content.strip()
+    content = re.sub(r"^```(?:json)?", "", content)
+    content = re.sub(r"```$", "", content)
+    content = re.sub(r"^'''(?:json)?", "", content)
+    content = re.sub(r"'''$", "", content)
+    content = content.strip()
+
+    match = re.search(r"\{[\s\S]*\}", content)
+    if match:
+        content = match.group(0).strip()
+
+    try:
+        parsed = json.loads(content)
+        sentiment = parsed.get("sentiment", "Happy")
+        priority = parsed.get("priority", "Low")
+    except Exception as e:
+        print("⚠️ JSON parse failed:", e)
+        print("Problematic content:", repr(content))
+        sentiment, priority = "Happy", "Low"
+
+    if sentiment not in SENTIMENTS:
+        sentiment = "Happy"
+    if priority not in PRIORITIES:
+        priority = "Low"
+    return {"sentiment": sentiment, "priority": priority}
+
+
+class TriageService:
+    """
+    Runs issue analysis on a background pool. Identical title/description
+    pairs share one in-flight request and one cached result, and results
+    are written back to the Issue row when an issue id is given. How the
+    local classifier is used depends on the configured engine (see ENGINES).
+    Every result records its "source", api or local, which is stored in
+    Issue.triage_source so the classifier is never trained on its own output.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.results = MemoryBackend(4096)
+        self._inflight = {}
+        self._lock = threading.RLock()
+        self._executor = None
+        self.session = None
+        self.workers = 4
+        self.engine = "fallback"
+        self.classifier = LocalClassifier()
+
+    def init_app(self, app):
+        self.app = app
+        self.endpoint = app.config["TRIAGE_ENDPOINT"]
+        self.api_key = app.config.get("TRIAGE_API_KEY")
+        self.timeout = app.config.get("TRIAGE_TIMEOUT", 15)
+        self.cache_ttl = app.config.get("TRIAGE_CACHE_TTL", 24 * 3600)
+        workers = app.config.get("TRIAGE_WORKERS", 4)
+        self.engine = app.config.get("TRIAGE_ENGINE", "fallback")
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unknown TRIAGE_ENGINE {self.engine!r}")
+        model_path = app.config.get("TRIAGE_MODEL_PATH")
+        if model_path and os.path.exists(model_path):
+            self.classifier = LocalClassifier.load(model_path)
+
+        self.workers = workers
+        self.session = None  # created by _http() on the first remote call
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="triage")
+
+    def submit(self, title, description, issue_id=None):
+        """Queue analysis and return its key; returns immediately."""
+        key = content_key(title, description)
+        if self.engine == "local" and self.results.get("done", key) is None:
+            self.results.set("done", key, self._classify(title, description), self.cache_ttl)
+
+        with self._lock:
+            cached = self.results.get("done", key)
+            future = None
+            if cached is None:
+                future = self._inflight.get(key)
+                if future is None:
+                    if self.engine == "first-pass":
+                        provisional = self._classify(title, description)
+                        self.results.set("provisional", key, provisional, self.cache_ttl)
+                        if issue_id is not None:
+                            self._executor.submit(self._store, issue_id, provisional)
+                    future = self._executor.submit(self._analyze, title, description)
+                    self._inflight[key] = future
+                    future.add_done_callback(lambda f: self._finish(key, f))
+
+        if issue_id is not None:
+            if cached is not None:
+                self._executor.submit(self._store, issue_id, cached)
+            else:
+                future.add_done_callback(lambda f: f.exception() or self._store(issue_id, f.result()))
+        return key
+
+    def status(self, key):
+        """
+        Return one of ("done", result), ("pending", provisional result or None),
+        ("failed", None), ("unknown", None).
+        """
+        # One lock hold: _finish moves a key from in-flight to done/failed
+        # under the same lock, so a finished job is never seen as neither.
+        with self._lock:
+            result = self.results.get("done", key)
+            if result is not None:
+                return "done", result
+            if key in self._inflight:
+                return "pending", self.results.get("provisional", key)
+            if self.results.get("failed", key):
+                return "failed", None
+        return "unknown", None
+
+    def _analyze(self, title, description):
+        try:
+            return self._call_api(title, description)
+        except Exception:
+            if self.engine == "api":
+                raise
+            traceback.print_exc()
+            return self._classify(title, description)
+
+    def _classify(self, title, description):
+        return {**self.classifier.classify(title, description), "source": "local"}
+
+    def _http(self):
+        # requests is imported here, not at startup: with TRIAGE_ENGINE=local it
+        # is never needed, and otherwise only once the first issue comes in.
+        if self.session is None:
+            with self._lock:
+                if self.session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self.session = session
+        return self.session
+
+    def _call_api(self, title, description):
+        payload = {
+            "model": "sonar",
+            "messages": [{"role": "user", "content": build_prompt(title, description)}],
+            "temperature": 0.3,
+            "max_tokens": 50,
+            "return_citations": False
+        }
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        resp = self._http().post(self.endpoint, headers=headers, json=payload, timeout=self.timeout)
+        resp.raise_for_status()
+        content = resp.json()["choices"][0]["message"]["content"]
+        return {**parse_result(content), "source": "api"}
+
+    def _finish(self, key, future):
+        with self._lock:
+            self._inflight.pop(key, None)
+            if future.exception() is None:
+                self.results.set("done", key, future.result(), self.cache_ttl)
+            else:
+                traceback.print_exception(future.exception())
+                self.results.set("failed", key, True, 60)
+
+    def _store(self, issue_id, result):
+        with self.app.app_context():
+            Issue.query.filter_by(id=issue_id).update(
+                {Issue.sentiment: result["sentiment"], Issue.priority: result["priority"],
+                 Issue.triage_source: result.get("source"), Issue.change_seq: next_seq()},
+                synchronize_session=False,
+            )
+            db.session.commit()
+
+
+triage_service = TriageService()
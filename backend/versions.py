@@ -0,0 +1,146 @@
+import datetime
+import hashlib
+import importlib
+from functools import wraps
+from flask import g, request, Response
+from flask_jwt_extended import get_jwt
+from sqlalchemy import event, update, insert
+from model import db, TableVersion, SyncCounter
+from compression import ENCODINGS
+
+# Tables whose writes invalidate conditional GETs.
+VERSIONED_TABLES = {
+    "issue", "issue_vote", "user", "worker_info", "notice", "mess",
+    "bus_timetable", "doctor", "student_medical",
+}
+
+
+def upsert_for(dialect_name):
+    """
+    The dialect's INSERT ... ON CONFLICT construct, or None. Imported on first
+    use so a SQLite deployment never loads the PostgreSQL dialect.
+    """
+    if dialect_name not in ("sqlite", "postgresql"):
+        return None
+    return importlib.import_module(f"sqlalchemy.dialects.{dialect_name}").insert
+
+
+def _bump(connection, names):
+    now = datetime.datetime.utcnow()
+    upsert = upsert_for(connection.dialect.name)
+    table = TableVersion.__table__
+    for name in sorted(names):
+        if upsert is not None:
+            stmt = upsert(table).values(name=name, version=1, updated_at=now).on_conflict_do_update(
+                index_elements=["name"], set_={"version": table.c.version + 1, "updated_at": now}
+            )
+            connection.execute(stmt)
+            continue
+        result = connection.execute(
+            update(table).where(table.c.name == name).values(version=table.c.version + 1, updated_at=now)
+        )
+        if not result.rowcount:
+            connection.execute(insert(table).values(name=name, version=1, updated_at=now))
+
+
+@event.listens_for(db.session, "after_flush")
+def _after_flush(session, flush_context):
+    names = {
+        obj.__table__.name
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if getattr(obj, "__table__", None) is not None
+    } & VERSIONED_TABLES
+    if names:
+        _bump(session.connection(), names)
+
+
+@event.listens_for(db.session, "do_orm_execute")
+def _bulk_write(state):
+    # Query.update()/delete() bypass the flush, so catch them here.
+    if not (state.is_update or state.is_delete):
+        return
+    name = state.statement.table.name
+    if name not in VERSIONED_TABLES:
+        return
+    result = state.invoke_statement()
+    if result.rowcount:
+        _bump(state.session.connection(), {name})
+    return result
+
+
+def next_seq(count=1):
+    """
+    Allocate the next change sequence number for an Issue or Notice write
+    (with ``count``, reserve that many and return the last of them).
+
+    The counter row stays locked until the caller commits, so sequence
+    numbers become visible in commit order and a client that has synced up
+    to N can never later miss a change numbered below N.
+    """
+    updated = SyncCounter.query.filter_by(name="changes") \
+        .update({SyncCounter.value: SyncCounter.value + count}, synchronize_session=False)
+    if not updated:
+        db.session.add(SyncCounter(name="changes", value=count))
+        db.session.flush()
+        return count
+    return db.session.query(SyncCounter.value).filter_by(name="changes").scalar()
+
+
+def current(*names):
+    """Return (version map, last modified) for ``names`` in one query."""
+    rows = TableVersion.query.filter(TableVersion.name.in_(names)).all()
+    versions = {r.name: r.version for r in rows}
+    last_modified = max((r.updated_at for r in rows), default=None)
+    return versions, last_modified
+
+
+def conditional(*tables):
+    """
+    Answer If-None-Match / If-Modified-Since for a GET view from the version
+    rows of ``tables`` alone, so unchanged polls get a 304 without the view
+    running. The ETag also covers the caller and query string, since views
+    may shape their response per user. The version string is left in
+    ``g.table_versions`` so response_cache keys its entries by it: a worker
+    whose memory cache missed another worker's invalidation cannot serve
+    the old body under the new ETag.
+    """
+    def wrapper(fn):
+        @wraps(fn)
+        def inner(*args, **kwargs):
+            versions, last_modified = current(*tables)
+            g.table_versions = "|".join(f"{t}:{versions.get(t, 0)}" for t in tables)
+            seed = "|".join([request.full_path, _identity(), g.table_versions])
+            etag = hashlib.sha1(seed.encode()).hexdigest()
+            if last_modified is not None:
+                last_modified = last_modified.replace(microsecond=0, tzinfo=datetime.timezone.utc)
+
+            if request.if_none_match:
+                # A compressed copy carries the ETag plus an encoding suffix.
+                variants = [etag] + [f"{etag}-{encoding}" for encoding in ENCODINGS]
+                matched = next((v for v in variants if request.if_none_match.contains(v)), None)
+                not_modified = matched is not None
+            else:
+                since = request.if_modified_since
+                not_modified = since is not None and last_modified is not None and last_modified <= since
+                matched = None
+            if not_modified:
+                resp = Response(status=304)
+                resp.set_etag(matched or etag)
+            else:
+                resp = fn(*args, **kwargs)
+                if not isinstance(resp, Response) or resp.status_code != 200:
+                    return resp
+                resp.set_etag(etag)
+            if last_modified is not None:
+                resp.last_modified = last_modified
+            return resp
+        return inner
+    return wrapper
+
+
+def _identity():
+    try:
+        claims = get_jwt()
+    except RuntimeError:
+        return "anonymous"
+    return f"{claims.get('sub', '')}:{claims.get('role', '')}"
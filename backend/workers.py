@@ -3,7 +3,9 @@ from flask_jwt_extended import (
     create_access_token, create_refresh_token,
     jwt_required, get_jwt_identity, get_jwt
 )
+from sqlalchemy import func
 from model import db, User, WorkerInfo
+from serializers import WORKER
 
 workers_bp = Blueprint("workers", __name__, url_prefix="/api/workers")
 
@@ -15,21 +17,11 @@ def get_workers():
         return jsonify({"error": "Admins only"}), 200
 
     workers = (
-        db.session.query(User, WorkerInfo)
+        db.session.query(User.id, User.full_name, User.email, User.role,
+                         func.coalesce(WorkerInfo.worker_type, "N/A").label("worker_type"))
         .outerjoin(WorkerInfo, WorkerInfo.user_id == User.id)
         .filter(User.role == "worker")
         .all()
     )
 
-    data = [
-        {
-            "id": user.id,
-            "name": user.full_name,
-            "email": user.email,
-            "role": user.role,
-            "worker_type": info.worker_type if info else "N/A",
-        }
-        for user, info in workers
-    ]
-
-    return jsonify(data), 200
\ No newline at end of file
+    return jsonify(WORKER.dump_all(workers)), 200
\ No newline at end of file
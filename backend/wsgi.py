@@ -0,0 +1,11 @@
+"""
+Production entry point:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Run flask --app app init-db (and flask --app app db upgrade) once before the
+first start; workers never create tables or accounts themselves.
+"""
+from app import create_app
+
+app = create_app()
@@ -34,7 +34,7 @@ export const IssueCard = ({ issue, onView, onEdit, onDelete, showActions = false
         </p>
       </CardContent>
       <CardFooter className="flex justify-between items-center">
-        <UpvoteButton issueId={issue.id} upvotes={issue.upvotes} voters={issue.voters} />
+        <UpvoteButton issueId={issue.id} upvotes={issue.upvotes} hasVoted={issue.hasVoted} />
         <div className="flex gap-2">
           <Button variant="outline" size="sm" onClick={() => onView(issue)}>
             <Eye className="h-4 w-4 mr-1" />
@@ -9,6 +9,7 @@ import {
 import { StatusBadge } from "./StatusBadge";
 import { Issue } from "@/contexts/DataContext";
 import { useData } from "@/contexts/DataContext";
+import { useAuth } from "@/contexts/AuthContext";
 import { Button } from "@/components/ui/button";
 import { RefreshCw } from "lucide-react";
 
@@ -20,20 +21,37 @@ interface IssueModalProps {
 
 export const IssueModal = ({ issue, open, onOpenChange }: IssueModalProps) => {
   const { categories } = useData();
+  const { user } = useAuth();
   const [sentiment, setSentiment] = useState<string>("Loading...");
   const [priority, setPriority] = useState<string>("Loading...");
   const [loading, setLoading] = useState<boolean>(false);
 
-  const fetchAnalysis = async (title: string, description: string) => {
+  const fetchAnalysis = async (issueId: number, title: string, description: string) => {
     try {
       setLoading(true);
-      const res = await fetch("http://localhost:5000/analyze_issue", {
+      let res = await fetch("http://localhost:5000/analyze_issue", {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ title, description }),
+        headers: {
+          "Content-Type": "application/json",
+          Authorization: `Bearer ${localStorage.getItem("access_token") ?? ""}`,
+        },
+        // Only the reporter or an admin may save the result on the issue;
+        // anyone else just gets an analysis of the text.
+        body: JSON.stringify(
+          user?.role === "admin" || issue?.createdBy === user?.name
+            ? { title, description, issue_id: issueId }
+            : { title, description }
+        ),
       });
 
-      if (!res.ok) throw new Error("Failed to fetch analysis");
+      // Analysis runs in the background; poll until it is ready.
+      for (let attempt = 0; res.status === 202 && attempt < 20; attempt++) {
+        const { key } = await res.json();
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        res = await fetch(`http://localhost:5000/analyze_issue/${key}`);
+      }
+
+      if (!res.ok || res.status === 202) throw new Error("Failed to fetch analysis");
 
       const data = await res.json();
       setSentiment(data.sentiment || "Unknown");
@@ -49,7 +67,12 @@ export const IssueModal = ({ issue, open, onOpenChange }: IssueModalProps) => {
 
   useEffect(() => {
     if (open && issue) {
-      fetchAnalysis(issue.title, issue.description);
+      if (issue.sentiment && issue.priority) {
+        setSentiment(issue.sentiment);
+        setPriority(issue.priority);
+      } else {
+        fetchAnalysis(issue.id, issue.title, issue.description);
+      }
     }
   }, [open, issue]);
 
@@ -95,7 +118,7 @@ export const IssueModal = ({ issue, open, onOpenChange }: IssueModalProps) => {
             <Button
               variant="outline"
               size="icon"
-              onClick={() => fetchAnalysis(issue.title, issue.description)}
+              onClick={() => fetchAnalysis(issue.id, issue.title, issue.description)}
               disabled={loading}
               title="Reanalyze"
             >
@@ -7,14 +7,12 @@ import { toast } from '@/hooks/use-toast';
 interface UpvoteButtonProps {
   issueId: number;
   upvotes: number;
-  voters: string[];
+  hasVoted?: boolean;
 }
 
-export const UpvoteButton = ({ issueId, upvotes, voters }: UpvoteButtonProps) => {
+export const UpvoteButton = ({ issueId, upvotes, hasVoted = false }: UpvoteButtonProps) => {
   const { user } = useAuth();
   const { upvoteIssue, downvoteIssue } = useData();
-  
-  const hasVoted = user && voters ? voters.includes(user.id) : false;
 
   const handleUpvote = async () => {
     if (!user) {
@@ -18,8 +18,10 @@ export interface Issue {
   createdBy: string;
   createdAt: string;
   upvotes: number;
-  voters: string[];
+  hasVoted?: boolean;
   assignee: string;
+  sentiment?: string | null;
+  priority?: string | null;
 }
 
 export interface Notice {
@@ -123,10 +125,24 @@ export const DataProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
       return { ok: res.ok, status: res.status, json, res };
     } catch (err) {
       console.error("safeFetch network error for", url, err);
-      return { ok: false, status: 0, json: null, error: err };
+      return { ok: false, status: 0, json: null, res: null, error: err };
     }
   };
 
+  // /api/issues is paginated: follow X-Next-Cursor until the last page
+  const fetchAllIssues = async () => {
+    const issues: Issue[] = [];
+    let cursor: string | null = null;
+    do {
+      const query = cursor ? `?limit=200&cursor=${encodeURIComponent(cursor)}` : "?limit=200";
+      const page = await safeFetch(`${API_BASE}/api/issues${query}`, { headers });
+      if (!page.ok || !Array.isArray(page.json)) return page;
+      issues.push(...page.json);
+      cursor = page.res?.headers.get("X-Next-Cursor") ?? null;
+    } while (cursor);
+    return { ok: true, status: 200, json: issues };
+  };
+
   const fetchAllData = async () => {
     try {
       setLoading(true);
@@ -141,7 +157,7 @@ export const DataProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
       doctorsRes,
       studentRecordsRes,
     ] = await Promise.all([
-      safeFetch(`${API_BASE}/api/issues`, { headers }),
+      fetchAllIssues(),
       safeFetch(`${API_BASE}/api/categories`, { headers }),
       safeFetch(`${API_BASE}/api/notices`, { headers }),
       safeFetch(`${API_BASE}/api/workers`, { headers }),
@@ -247,6 +263,17 @@ export const DataProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
         headers,
         body: JSON.stringify(issueData),
       });
+      if (res.status === 409) {
+        // An open issue nearby looks like the same complaint: offer to upvote it instead.
+        const { duplicates } = await res.json();
+        const match = duplicates[0];
+        if (window.confirm(`"${match.title}" (room ${match.roomNumber}) looks like the same problem. Upvote it instead of reporting a new issue?`)) {
+          if (!match.hasVoted) await upvoteIssue(match.id);
+          toast.success("Upvoted the existing issue");
+          return;
+        }
+        return addIssue({ ...issueData, force: true });
+      }
       if (!res.ok) throw new Error();
       await fetchAllData();
       toast.success("Issue reported successfully!");
@@ -348,7 +375,7 @@ export const DataProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
       return;
     }
     try {
-      const res = await fetch(`${API_BASE}/api/issues/${issueId}/downvote`, {
+      const res = await fetch(`${API_BASE}/api/issues/${issueId}/upvote`, {
         method: "POST",
         headers,
         body: JSON.stringify({ userId: user.id }),
@@ -1,6 +1,8 @@
 
 echo "Running Backend"
-(cd backend && source .venv/bin/activate && python app.py) &
+(cd backend && source .venv/bin/activate \
+  && flask db upgrade && flask init-db && flask backfill-votes && flask rebuild-rollups \
+  && gunicorn -c gunicorn.conf.py wsgi:app) &
 
 echo "Running Frontend"
 (cd frontend && npm run dev)